@@ -3,6 +3,17 @@ from pathlib import Path
 import duckdb
 from loguru import logger
 
+from vino_db.config import CONFIG_PATH, load_config
+from vino_db.profiles import execution_settings
+from vino_db.queries import LOADERS_DIR, get_registry
+from vino_db.rollups import (
+    append_ratings,
+    build_rollups,
+    rating_trends,
+    rollups_exist,
+)
+from vino_db.search import build_search_index
+
 
 class WineDatabase:
     def __init__(
@@ -10,21 +21,40 @@ class WineDatabase:
         db_path: str = "xwines.duckdb",
         recreate_db: bool = False,
         sql_dir: Path = Path("sql"),
+        duckdb_config: dict | None = None,
+        profile: str | None = None,
     ):
         """
         Connect to DuckDB and optionally recreate schema from SQL files.
         :param db_path: DuckDB database path or ':memory:' for in-memory DB.
         :param recreate_db: If True, drop and create tables fresh.
         :param sql_dir: Directory containing SQL files to create tables.
+        :param duckdb_config: DuckDB settings, e.g. from `VinoConfig.duckdb_config()`.
+        :param profile: Execution profile ('laptop' or 'server'), overridden by duckdb_config.
         """
         self.db_path = db_path
-        self.conn = duckdb.connect(self.db_path)
+        self.conn = duckdb.connect(
+            self.db_path, config=execution_settings(profile, duckdb_config)
+        )
         self.sql_dir = Path(sql_dir)
         if recreate_db:
             logger.info("Recreating database schema...")
             self._execute_sql_file(self.sql_dir / "drop_tables.sql")
             self._execute_sql_file(self.sql_dir / "create_tables.sql")
 
+    @classmethod
+    def from_config(
+        cls, config_path: str = CONFIG_PATH, recreate_db: bool = False
+    ) -> "WineDatabase":
+        """Connect using the database paths and DuckDB settings from the TOML config."""
+        config = load_config(config_path)
+        return cls(
+            db_path=config.database.path,
+            recreate_db=recreate_db,
+            sql_dir=config.database.sql_dir,
+            duckdb_config=config.duckdb_config(),
+        )
+
     def _execute_sql_file(self, filepath: Path):
         """Helper to execute all SQL statements in a file."""
         with open(filepath, "r") as f:
@@ -33,40 +63,40 @@ class WineDatabase:
         logger.info(f"Executed SQL file: {filepath.name}")
 
     def load_data(self, wines_csv: Path, ratings_csv: Path):
+        """Bulk load the wines and ratings CSVs, rebuilding the rollups if present."""
+        queries = get_registry(self.sql_dir / LOADERS_DIR.name)
         logger.info("Loading wines CSV...")
-        self.conn.execute(f"""
-            INSERT INTO wines
-            SELECT * FROM read_csv(
-                '{wines_csv}',
-                auto_detect=True,
-                header=True,
-                strict_mode=False,
-                ignore_errors=True
-            );
-        """)
+        queries.execute(self.conn, "load_wines", path=str(wines_csv))
         logger.info("Loading users from ratings CSV...")
-        self.conn.execute(f"""
-            INSERT INTO users
-            SELECT DISTINCT UserID AS user_id FROM read_csv(
-                '{ratings_csv}',
-                auto_detect=True,
-                header=True,
-                strict_mode=False,
-                ignore_errors=True
-            );
-        """)
+        queries.execute(self.conn, "load_users", path=str(ratings_csv))
         logger.info("Loading ratings CSV...")
-        self.conn.execute(f"""
-            INSERT INTO ratings
-            SELECT * FROM read_csv(
-                '{ratings_csv}',
-                auto_detect=True,
-                header=True,
-                strict_mode=False,
-                ignore_errors=True
-            );
-        """)
+        queries.execute(self.conn, "load_ratings", path=str(ratings_csv))
         logger.info("Data loaded successfully.")
+        if rollups_exist(self.conn):
+            # A bulk load bypasses incremental maintenance, so rebuild in full
+            self.create_rollups()
+
+    def append_ratings(self, ratings_csv: Path):
+        """
+        Append a ratings CSV (same layout as the X-Wines ratings file), adding any
+        new users, and fold the new ratings into the rollups in one transaction.
+        """
+        append_ratings(self.conn, ratings_csv, self.sql_dir / LOADERS_DIR.name)
+        logger.info("Ratings appended successfully.")
+
+    def create_rollups(self):
+        """Build the day and month rating rollups used by `rating_trends`."""
+        logger.info("Building ratings rollups...")
+        build_rollups(self.conn)
+
+    def rating_trends(self, granularity: str = "month", **kwargs):
+        """Rating volume and mean over time from the rollups; see `vino_db.rollups.rating_trends`."""
+        return rating_trends(self.conn, granularity, **kwargs)
+
+    def create_search_index(self):
+        """Build the trigram index over wine, winery and region names."""
+        logger.info("Building wine search index...")
+        build_search_index(self.conn)
 
     def close(self):
         """Close DuckDB connection."""
@@ -75,18 +105,12 @@ class WineDatabase:
 
 
 if __name__ == "__main__":
-    db = WineDatabase(
-        db_path="data/xwines.duckdb", recreate_db=True, sql_dir=Path("sql")
-    )
+    config = load_config()
+    db = WineDatabase.from_config(recreate_db=True)
 
     try:
-        db.load_data(
-            Path(
-                "data/xwines/All-XWines_Full_100K_wines_21M_ratings/XWines_Full_100K_wines.csv"
-            ),
-            Path(
-                "data/xwines/All-XWines_Full_100K_wines_21M_ratings/XWines_Full_21M_ratings.csv"
-            ),
-        )
+        db.load_data(config.database.wines_csv, config.database.ratings_csv)
+        db.create_search_index()
+        db.create_rollups()
     finally:
         db.close()
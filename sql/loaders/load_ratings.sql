@@ -0,0 +1,10 @@
+-- Load the X-Wines ratings CSV into the ratings table.
+-- :param path: VARCHAR
+INSERT INTO ratings
+SELECT * FROM read_csv(
+  $path,
+  auto_detect=True,
+  header=True,
+  strict_mode=False,
+  ignore_errors=True
+);
@@ -0,0 +1,10 @@
+-- Load the distinct users of the X-Wines ratings CSV into the users table.
+-- :param path: VARCHAR
+INSERT INTO users
+SELECT DISTINCT UserID AS user_id FROM read_csv(
+  $path,
+  auto_detect=True,
+  header=True,
+  strict_mode=False,
+  ignore_errors=True
+);
@@ -0,0 +1,10 @@
+-- Load the X-Wines wines CSV into the wines table.
+-- :param path: VARCHAR
+INSERT INTO wines
+SELECT * FROM read_csv(
+  $path,
+  auto_detect=True,
+  header=True,
+  strict_mode=False,
+  ignore_errors=True
+);
@@ -0,0 +1,10 @@
+-- Stage a ratings CSV in the new_ratings temporary table before appending it.
+-- :param path: VARCHAR
+INSERT INTO new_ratings
+SELECT * FROM read_csv(
+  $path,
+  auto_detect=True,
+  header=True,
+  strict_mode=False,
+  ignore_errors=True
+);
@@ -0,0 +1,16 @@
+-- Ratings made in the half-open interval [start_date, end_date).
+-- :param start_date: TIMESTAMP
+-- :param end_date: TIMESTAMP
+-- :param limit: INTEGER
+SELECT
+  rating_id,
+  rating_date,
+  user_id,
+  wine_id,
+  vintage,
+  rating
+FROM ratings
+WHERE rating_date >= $start_date
+  AND rating_date < $end_date
+ORDER BY rating_date, rating_id
+LIMIT $limit;
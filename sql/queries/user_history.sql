@@ -0,0 +1,16 @@
+-- Most recent ratings made by a single user.
+-- :param user_id: BIGINT
+-- :param limit: INTEGER
+SELECT
+  r.rating_id,
+  r.rating_date,
+  r.wine_id,
+  w.wine_name,
+  w.winery_name,
+  r.vintage,
+  r.rating
+FROM ratings r
+LEFT JOIN wines w ON w.wine_id = r.wine_id
+WHERE r.user_id = $user_id
+ORDER BY r.rating_date DESC, r.rating_id DESC
+LIMIT $limit;
@@ -0,0 +1,19 @@
+-- Rating statistics for a single wine.
+-- :param wine_id: INTEGER
+SELECT
+  w.wine_id,
+  w.wine_name,
+  w.winery_name,
+  COUNT(r.rating) AS rating_count,
+  AVG(r.rating) AS mean_rating,
+  STDDEV_POP(r.rating) AS stddev_rating,
+  MIN(r.rating) AS min_rating,
+  MAX(r.rating) AS max_rating,
+  MIN(r.rating_date) AS first_rating_date,
+  MAX(r.rating_date) AS last_rating_date
+FROM wines w
+LEFT JOIN ratings r ON r.wine_id = w.wine_id
+WHERE w.wine_id = $wine_id
+GROUP BY w.wine_id, w.wine_name, w.winery_name
+-- One row per wine; the explicit bound lets the result-size guard skip planning
+LIMIT 1;
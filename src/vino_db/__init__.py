@@ -1,2 +1,4 @@
 def main() -> None:
-    print("Hello from vino-db!")
+    from vino_db.cli import cli
+
+    cli()
@@ -0,0 +1,108 @@
+import click
+
+from vino_db.config import CONFIG_PATH, read_config, resolve_default_service
+
+
+def get_available_services(config_path: str) -> tuple[list[str], str]:
+    """Load available service names and default service from the TOML config."""
+    config = read_config(config_path)
+    services = list(config.get("services", {}).keys())
+    default_service = resolve_default_service(
+        config.get("default_service", ""), services
+    )
+    return services, default_service
+
+
+@click.command()
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def list_services(config: str):
+    """List available chat services from the config file."""
+    try:
+        services, default_service = get_available_services(config)
+        if not services:
+            click.echo("No services found in config file.")
+            return
+        click.echo(f"Available chat services (default: {default_service}):")
+        for service in services:
+            click.echo(f"- {service}")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except Exception as e:
+        click.echo(f"Error loading services: {e}")
+
+
+@click.command()
+@click.option(
+    "--service",
+    default=None,
+    help="Name of the chat service (e.g., perplexity). Defaults to config's default_service.",
+)
+@click.option("--prompt", default=None, help="Prompt to send to the chat UI")
+@click.option(
+    "--prompt-file",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Path to a .md file containing the prompt",
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def run_prompt(service: str, prompt: str, prompt_file: str, config: str):
+    """Run a prompt on the selected chat service."""
+    try:
+        # Load services and default service
+        services, default_service = get_available_services(config)
+        if not services:
+            raise click.UsageError("No services defined in config file")
+
+        # Use default service if none provided
+        selected_service = service if service else default_service
+        if not selected_service:
+            raise click.UsageError(
+                "No default service defined in config and no service specified"
+            )
+
+        # Validate selected service
+        if selected_service not in services:
+            raise click.UsageError(
+                f"Service '{selected_service}' not found. Available: {', '.join(services)}"
+            )
+
+        # Ensure exactly one of --prompt or --prompt-file is provided
+        if (prompt is None and prompt_file is None) or (
+            prompt is not None and prompt_file is not None
+        ):
+            raise click.UsageError(
+                "Must provide either --prompt or --prompt-file, but not both"
+            )
+
+        # If prompt-file is provided, read the file
+        if prompt_file:
+            if not prompt_file.endswith(".md"):
+                raise click.UsageError("Prompt file must have a .md extension")
+            with open(prompt_file, "r", encoding="utf-8") as f:
+                prompt = f.read().strip()
+
+        # Ensure prompt is not empty
+        if not prompt:
+            raise click.UsageError("Prompt cannot be empty")
+
+        import asyncio
+
+        from vino_db.web_chat import ChatWebUIClient
+
+        client = ChatWebUIClient.from_config(config, selected_service)
+        response = asyncio.run(client.run_prompt(prompt))
+        click.echo(f"Response from {selected_service}:\n{response.raw_text}")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except KeyError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except RuntimeError as e:
+        click.echo(f"Error running prompt: {e}")
+    except click.UsageError as e:
+        click.echo(f"Error: {e}")
+    except Exception as e:
+        click.echo(f"Unexpected error: {e}")
@@ -0,0 +1,412 @@
+from pathlib import Path
+
+import click
+
+from vino_db.config import CONFIG_PATH
+
+# duckdb, pandas and the query modules are imported inside each command so that
+# listing or dispatching commands stays cheap.
+
+
+def _resolve_db(db: str | None, config: str) -> tuple[str, dict]:
+    """Database path (--db or the config's database.path) and DuckDB settings."""
+    from vino_db.config import load_config
+
+    vino_config = load_config(config)
+    db = db or vino_config.database.path
+    if not Path(db).exists():
+        raise FileNotFoundError(f"Database file not found: {db}")
+    return db, vino_config.duckdb_config()
+
+
+def _parse_params(params: tuple[str, ...]) -> dict[str, str]:
+    parsed = {}
+    for param in params:
+        name, sep, value = param.partition("=")
+        if not sep or not name:
+            raise click.UsageError(f"Parameter must be NAME=VALUE, got '{param}'")
+        parsed[name] = value
+    return parsed
+
+
+def _echo_frame(df, empty_message: str):
+    if df.empty:
+        click.echo(empty_message)
+        return
+    click.echo(df.to_string(index=False))
+
+
+@click.command()
+@click.argument("query")
+@click.option(
+    "--limit", default=10, show_default=True, help="Maximum number of matches"
+)
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def search(query: str, limit: int, db: str, config: str):
+    """Search wines by (partial or misspelt) wine, winery or region name."""
+    import duckdb
+
+    from vino_db.search import search_wines
+
+    try:
+        db, duckdb_config = _resolve_db(db, config)
+        conn = duckdb.connect(db, read_only=True, config=duckdb_config)
+        try:
+            matches = search_wines(conn, query, limit)
+        finally:
+            conn.close()
+        _echo_frame(matches, f"No wines found matching '{query}'.")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error searching wines: {e}")
+
+
+@click.command()
+@click.argument("name", required=False)
+@click.option(
+    "--param", "-p", "params", multiple=True, help="Query parameter as NAME=VALUE"
+)
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def query(name: str | None, params: tuple[str, ...], db: str, config: str):
+    """Run the named query NAME from the query registry (lists queries if omitted)."""
+    import duckdb
+
+    from vino_db.config import load_config
+    from vino_db.queries import get_registry
+
+    try:
+        registry = get_registry(load_config(config).database.sql_dir / "queries")
+        if name is None:
+            for template in registry.templates.values():
+                declared = ", ".join(f"{p}: {t}" for p, t in template.params.items())
+                click.echo(f"- {template.name}({declared}): {template.description}")
+            return
+        db, duckdb_config = _resolve_db(db, config)
+        conn = duckdb.connect(db, read_only=True, config=duckdb_config)
+        try:
+            result = registry.execute(conn, name, **_parse_params(params)).df()
+        finally:
+            conn.close()
+        _echo_frame(result, f"Query '{name}' returned no rows.")
+    except click.UsageError as e:
+        click.echo(f"Error: {e}")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except KeyError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error running query: {e}")
+
+
+@click.command()
+@click.argument("wine_id", type=int)
+@click.option("--limit", default=10, show_default=True, help="Maximum number of wines")
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def similar_wines(wine_id: int, limit: int, db: str, config: str):
+    """List the wines most similar to WINE_ID."""
+    import duckdb
+
+    from vino_db.recommend import WineRecommender
+
+    try:
+        db, duckdb_config = _resolve_db(db, config)
+        recommender = WineRecommender(db, read_only=True, duckdb_config=duckdb_config)
+        try:
+            neighbours = recommender.similar_wines(wine_id, limit)
+        finally:
+            recommender.close()
+        _echo_frame(neighbours, f"No similar wines found for wine {wine_id}.")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error finding similar wines: {e}")
+
+
+@click.command()
+@click.argument("user_id", type=int)
+@click.option("--limit", default=10, show_default=True, help="Maximum number of wines")
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def recommend(user_id: int, limit: int, db: str, config: str):
+    """Recommend unrated wines for USER_ID."""
+    import duckdb
+
+    from vino_db.recommend import WineRecommender
+
+    try:
+        db, duckdb_config = _resolve_db(db, config)
+        recommender = WineRecommender(db, read_only=True, duckdb_config=duckdb_config)
+        try:
+            recommendations = recommender.recommend_for_user(user_id, limit)
+        finally:
+            recommender.close()
+        _echo_frame(recommendations, f"No recommendations found for user {user_id}.")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error recommending wines: {e}")
+
+
+@click.command()
+@click.option(
+    "--granularity",
+    type=click.Choice(["day", "week", "month", "quarter", "year"]),
+    default="month",
+    show_default=True,
+    help="Output period",
+)
+@click.option("--start", default=None, help="Inclusive start date (YYYY-MM-DD)")
+@click.option("--end", default=None, help="Exclusive end date (YYYY-MM-DD)")
+@click.option(
+    "--by",
+    "group_by",
+    multiple=True,
+    type=click.Choice(["type", "country", "region_name"]),
+    help="Break the series down by a wine attribute",
+)
+@click.option(
+    "--where", "filters", multiple=True, help="Filter on a wine attribute as KEY=VALUE"
+)
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def trends(
+    granularity: str,
+    start: str | None,
+    end: str | None,
+    group_by: tuple[str, ...],
+    filters: tuple[str, ...],
+    db: str,
+    config: str,
+):
+    """Rating volume and mean rating over time, from the ratings rollups."""
+    import duckdb
+
+    from vino_db.rollups import rating_trends
+
+    try:
+        db, duckdb_config = _resolve_db(db, config)
+        conn = duckdb.connect(db, read_only=True, config=duckdb_config)
+        try:
+            result = rating_trends(
+                conn,
+                granularity,
+                start=start,
+                end=end,
+                group_by=group_by,
+                filters=_parse_params(filters),
+            )
+        finally:
+            conn.close()
+        _echo_frame(result, "No ratings in the selected period.")
+    except click.UsageError as e:
+        click.echo(f"Error: {e}")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error computing trends: {e}")
+
+
+@click.command()
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def build_search_index(db: str, config: str):
+    """(Re)build the wine name search index."""
+    import duckdb
+
+    from vino_db import search
+
+    try:
+        db, duckdb_config = _resolve_db(db, config)
+        conn = duckdb.connect(db, config=duckdb_config)
+        try:
+            row_count = search.build_search_index(conn)
+        finally:
+            conn.close()
+        click.echo(f"Search index built ({row_count} trigrams).")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error building search index: {e}")
+
+
+@click.command()
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def build_rollups(db: str, config: str):
+    """(Re)build the day and month ratings rollups used by trends."""
+    import duckdb
+
+    from vino_db import rollups
+
+    try:
+        db, duckdb_config = _resolve_db(db, config)
+        conn = duckdb.connect(db, config=duckdb_config)
+        try:
+            rollups.build_rollups(conn)
+        finally:
+            conn.close()
+        click.echo("Ratings rollups built.")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error building rollups: {e}")
+
+
+@click.command()
+@click.argument("ratings_csv", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def append_ratings(ratings_csv: str, db: str, config: str):
+    """Append RATINGS_CSV to the ratings table, keeping the rollups up to date."""
+    import duckdb
+
+    from vino_db import rollups
+    from vino_db.config import load_config
+
+    try:
+        sql_dir = load_config(config).database.sql_dir
+        db, duckdb_config = _resolve_db(db, config)
+        conn = duckdb.connect(db, config=duckdb_config)
+        try:
+            row_count = rollups.append_ratings(conn, ratings_csv, sql_dir / "loaders")
+        finally:
+            conn.close()
+        click.echo(f"Appended {row_count} ratings.")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except KeyError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error appending ratings: {e}")
+
+
+@click.command()
+@click.option("--k", default=50, show_default=True, help="Neighbours kept per wine")
+@click.option(
+    "--method",
+    type=click.Choice(["cosine", "adjusted_cosine"]),
+    default="adjusted_cosine",
+    show_default=True,
+    help="Similarity measure",
+)
+@click.option(
+    "--min-support", default=3, show_default=True, help="Minimum co-rating users"
+)
+@click.option("--block-size", default=2000, show_default=True, help="Wines per block")
+@click.option(
+    "--workers",
+    default=None,
+    type=int,
+    help="Worker processes (default: the configured DuckDB thread count)",
+)
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def build_neighbours(
+    k: int,
+    method: str,
+    min_support: int,
+    block_size: int,
+    workers: int,
+    db: str,
+    config: str,
+):
+    """(Re)build the wine_neighbours table used by similar-wines and recommend."""
+    import duckdb
+
+    from vino_db.recommend import WineRecommender
+
+    try:
+        db, duckdb_config = _resolve_db(db, config)
+        recommender = WineRecommender(db, duckdb_config=duckdb_config)
+        try:
+            row_count = recommender.build_neighbours(
+                k=k,
+                method=method,
+                min_support=min_support,
+                block_size=block_size,
+                workers=workers,
+            )
+        finally:
+            recommender.close()
+        click.echo(f"wine_neighbours built ({row_count} rows).")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+    except duckdb.Error as e:
+        click.echo(f"Error building neighbours: {e}")
+
+
+@click.command()
+@click.option("--host", default=None, help="Interface to bind (default: from config)")
+@click.option(
+    "--port", default=None, type=int, help="Port to listen on (default: from config)"
+)
+@click.option(
+    "--db", default=None, help="Path to the DuckDB database (default: from config)"
+)
+@click.option("--config", default=CONFIG_PATH, help="Path to TOML config file")
+def serve(host: str | None, port: int | None, db: str, config: str):
+    """Serve queries, search and stats over local HTTP from one read-only connection."""
+    try:
+        from vino_db import server
+        from vino_db.config import load_config
+
+        vino_config = load_config(config)
+        db, duckdb_config = _resolve_db(db, config)
+        service = server.QueryService(
+            db,
+            duckdb_config=duckdb_config,
+            queries_dir=vino_config.database.sql_dir / "queries",
+            max_concurrency=vino_config.server.max_concurrency,
+            page_size=vino_config.server.page_size,
+            cursor_ttl=vino_config.server.cursor_ttl,
+        )
+        host = host or vino_config.server.host
+        port = port or vino_config.server.port
+        click.echo(f"Serving {db} on http://{host}:{port}")
+        server.serve(service, host=host, port=port)
+    except ImportError as e:
+        click.echo(f"Error: {e}")
+    except FileNotFoundError as e:
+        click.echo(f"Error: {e}")
+    except ValueError as e:
+        click.echo(f"Error: {e}")
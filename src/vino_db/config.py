@@ -0,0 +1,79 @@
+import tomllib
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from vino_db.config_models import VinoConfig
+
+CONFIG_PATH = "conf/config.toml"
+
+# Parsing is memoised per resolved path and mtime, so every caller in a process
+# shares one parse (and one validated model) until the file is edited. Only
+# load_config imports pydantic, keeping read_config cheap for quick CLI commands.
+
+
+def _cache_key(config_path: str | Path) -> tuple[str, int]:
+    path = Path(config_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    return str(path.resolve()), path.stat().st_mtime_ns
+
+
+@lru_cache(maxsize=8)
+def _read_config(config_path: str, mtime_ns: int) -> dict:
+    try:
+        with open(config_path, "rb") as f:  # Open in binary mode for tomllib
+            return tomllib.load(f)
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"Invalid TOML file: {e}")
+
+
+@lru_cache(maxsize=8)
+def _load_config(config_path: str, mtime_ns: int) -> "VinoConfig":
+    from pydantic import ValidationError
+
+    from vino_db.config_models import VinoConfig
+
+    try:
+        return VinoConfig.model_validate(_read_config(config_path, mtime_ns))
+    except ValidationError as e:
+        raise ValueError(f"Invalid config file {config_path}: {e}")
+
+
+def resolve_default_service(default_service: str, services: list[str]) -> str:
+    """
+    The service used when none is named: default_service, else the first service.
+
+    :param default_service: Configured default service name, possibly empty
+    :param services: Names of the configured services
+    :return: Service name, or an empty string when no services are configured
+    """
+    if not default_service and services:
+        # Fallback to first service if default_service is not set
+        default_service = services[0]
+    if default_service and default_service not in services:
+        raise ValueError(
+            f"default_service '{default_service}' is not defined under [services]"
+        )
+    return default_service
+
+
+def read_config(config_path: str | Path = CONFIG_PATH) -> dict:
+    """
+    Parse the TOML config without validating it.
+
+    :param config_path: Path to the TOML configuration file
+    :return: Raw TOML tables (shared, do not mutate)
+    """
+    return _read_config(*_cache_key(config_path))
+
+
+def load_config(config_path: str | Path = CONFIG_PATH) -> "VinoConfig":
+    """
+    Parse and validate the TOML config.
+
+    :param config_path: Path to the TOML configuration file
+    :return: VinoConfig instance shared by all callers until the file changes
+    """
+    return _load_config(*_cache_key(config_path))
@@ -0,0 +1,123 @@
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from vino_db.config import resolve_default_service
+from vino_db.profiles import execution_settings, get_profile, parse_size
+
+
+class ServiceConfig(BaseModel):
+    """Selectors and browser settings for one chat web UI."""
+
+    ui_url: str
+    input_selector: str
+    submit_selector: str
+    response_selector: str
+    headless: bool = True
+    timeout: int = Field(30000, gt=0, description="Navigation/selector timeout (ms)")
+
+
+class DatabaseConfig(BaseModel):
+    """Locations of the DuckDB database, SQL scripts and source CSV files."""
+
+    path: str = "data/xwines.duckdb"
+    sql_dir: Path = Path("sql")
+    wines_csv: Path = Path(
+        "data/xwines/All-XWines_Full_100K_wines_21M_ratings/XWines_Full_100K_wines.csv"
+    )
+    ratings_csv: Path = Path(
+        "data/xwines/All-XWines_Full_100K_wines_21M_ratings/XWines_Full_21M_ratings.csv"
+    )
+
+
+class DuckDBSettings(BaseModel):
+    """
+    DuckDB performance settings. A named execution profile supplies defaults;
+    explicit values override it and unset values keep DuckDB's defaults.
+    """
+
+    profile: str | None = Field(None, description="Execution profile, e.g. 'laptop'")
+    threads: int | None = Field(None, ge=1)
+    memory_limit: str | None = Field(None, description="e.g. '4GB'")
+    temp_directory: Path | None = Field(
+        None, description="Spill directory (DuckDB defaults to <database>.tmp)"
+    )
+    max_temp_directory_size: str | None = Field(None, description="e.g. '50GB'")
+    preserve_insertion_order: bool | None = None
+    result_budget: str | None = Field(
+        None, description="Largest estimated result loaded into memory, e.g. '1GB'"
+    )
+    on_large_result: Literal["error", "stream", "parquet"] = "error"
+
+    @field_validator("profile")
+    @classmethod
+    def _check_profile(cls, profile: str | None) -> str | None:
+        if profile is not None:
+            get_profile(profile)
+        return profile
+
+    @field_validator("memory_limit", "max_temp_directory_size", "result_budget")
+    @classmethod
+    def _check_size(cls, size: str | None) -> str | None:
+        if size is not None:
+            parse_size(size)
+        return size
+
+
+class CacheConfig(BaseModel):
+    """Root directory for local caches, such as Parquet query results."""
+
+    dir: Path = Path(".cache")
+
+
+class ServerConfig(BaseModel):
+    """Settings for the local HTTP query service."""
+
+    host: str = "127.0.0.1"
+    port: int = Field(8765, ge=1, le=65535)
+    max_concurrency: int = Field(8, ge=1, description="Queries executing at once")
+    page_size: int = Field(1000, ge=1, description="Default rows per JSON page")
+    cursor_ttl: float = Field(
+        300.0, gt=0, description="Idle pagination cursor lifetime (s)"
+    )
+
+
+class VinoConfig(BaseModel):
+    """Validated contents of conf/config.toml."""
+
+    default_service: str = ""
+    services: dict[str, ServiceConfig] = {}
+    database: DatabaseConfig = DatabaseConfig()
+    duckdb: DuckDBSettings = DuckDBSettings()
+    cache: CacheConfig = CacheConfig()
+    server: ServerConfig = ServerConfig()
+
+    @model_validator(mode="after")
+    def _resolve_default_service(self) -> "VinoConfig":
+        self.default_service = resolve_default_service(
+            self.default_service, list(self.services)
+        )
+        return self
+
+    def duckdb_config(self) -> dict[str, str | int | bool]:
+        """Settings to pass as `config=` to `duckdb.connect`, profile included."""
+        explicit = self.duckdb.model_dump(
+            include={
+                "threads",
+                "memory_limit",
+                "temp_directory",
+                "max_temp_directory_size",
+                "preserve_insertion_order",
+            },
+            exclude_none=True,
+        )
+        if "temp_directory" in explicit:
+            explicit["temp_directory"] = str(explicit["temp_directory"])
+        return execution_settings(self.duckdb.profile, explicit)
+
+    def result_budget(self) -> str | None:
+        """Result memory budget: the explicit value, else the profile's, else None."""
+        if self.duckdb.result_budget or not self.duckdb.profile:
+            return self.duckdb.result_budget
+        return get_profile(self.duckdb.profile).result_budget
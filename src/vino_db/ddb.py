@@ -1,129 +1,299 @@
-    import sys
-    import time
-    from pathlib import Path
+import sys
+import time
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from secrets import token_hex
 
-    import duckdb
-    from loguru import logger
-    from pandas import DataFrame
+import duckdb
+from loguru import logger
+from pandas import DataFrame
 
+from vino_db.config import CONFIG_PATH, load_config
+from vino_db.execution import (
+    ResultShape,
+    ResultTooLargeError,
+    estimate_result_bytes,
+    fetch_batches,
+    is_single_select,
+    result_shape,
+    write_parquet,
+)
+from vino_db.profiles import (
+    LARGE_RESULT_ACTIONS,
+    execution_settings,
+    get_profile,
+    parse_size,
+)
+from vino_db.queries import QUERIES_DIR, QueryTemplate, get_registry
 
-    class DuckDBRunner:
-        def __init__(
-            self, db_path: str = ":memory:", log_file: str = None, verbose: bool = True
-        ):
-            self.db_path = db_path
+
+@lru_cache(maxsize=32)
+def _read_sql_file(sql_path: str, mtime_ns: int, encoding: str) -> str:
+    # mtime_ns is part of the cache key so an edited file is read again
+    with open(sql_path, "r", encoding=encoding) as f:
+        return f.read()
+
+
+class DuckDBRunner:
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        log_file: str = None,
+        verbose: bool = True,
+        duckdb_config: dict | None = None,
+        queries_dir: Path = QUERIES_DIR,
+        profile: str | None = None,
+        result_budget: str | int | None = None,
+        on_large_result: str = "error",
+        results_dir: Path = Path(".cache/results"),
+    ):
+        """
+        :param db_path: DuckDB database path or ':memory:' for in-memory DB.
+        :param log_file: Optional file to also log to.
+        :param verbose: Log connections and query timings.
+        :param duckdb_config: Explicit DuckDB settings; these override the profile.
+        :param queries_dir: Directory of named query templates for `run_query`.
+        :param profile: Execution profile name, e.g. 'laptop' or 'server'.
+        :param result_budget: Largest estimated result `run` may load into memory
+            (e.g. '1GB'); defaults to the profile's budget, or no limit.
+        :param on_large_result: What `run` does with a result over budget: 'error'
+            raises ResultTooLargeError, 'stream' returns an iterator of DataFrame
+            batches (read from a cursor of its own, so other queries can run
+            meanwhile, but it must be consumed before the runner exits) and
+            'parquet' writes it to results_dir and returns the path.
+        :param results_dir: Directory for Parquet results.
+        """
+        if on_large_result not in LARGE_RESULT_ACTIONS:
+            raise ValueError(
+                f"on_large_result must be one of: {', '.join(LARGE_RESULT_ACTIONS)}"
+            )
+        self.db_path = db_path
+        self.conn = None
+        self.verbose = verbose
+        self.duckdb_config = execution_settings(profile, duckdb_config)
+        self.queries_dir = Path(queries_dir)
+        if result_budget is None and profile:
+            result_budget = get_profile(profile).result_budget
+        self.result_budget = parse_size(result_budget) if result_budget else None
+        self.on_large_result = on_large_result
+        self.results_dir = Path(results_dir)
+        # Result shapes of the named queries, worked out on first use
+        self._result_shapes: dict[str, ResultShape] = {}
+        if log_file:
+            logger.add(log_file, level="INFO")
+
+    @classmethod
+    def from_config(cls, config_path: str = CONFIG_PATH, **kwargs) -> "DuckDBRunner":
+        """
+        Initialise with the database path and DuckDB settings from the TOML config.
+        Remaining keyword arguments are passed to the constructor.
+        """
+        config = load_config(config_path)
+        settings = {
+            "db_path": config.database.path,
+            "duckdb_config": config.duckdb_config(),
+            "queries_dir": config.database.sql_dir / "queries",
+            "result_budget": config.result_budget(),
+            "on_large_result": config.duckdb.on_large_result,
+            "results_dir": config.cache.dir / "results",
+        }
+        return cls(**{**settings, **kwargs})
+
+    def __enter__(self):
+        try:
+            self.conn = duckdb.connect(self.db_path, config=self.duckdb_config)
+            if self.verbose:
+                logger.info(f"DuckDB connected to {self.db_path}")
+            return self
+        except Exception as e:
+            logger.error(f"Failed to connect to DuckDB at {self.db_path}: {e}")
+            raise
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.conn:
+            self.conn.close()
+            if self.verbose:
+                logger.info("DuckDB connection closed")
             self.conn = None
-            self.verbose = verbose
-            if log_file:
-                logger.add(log_file, level="INFO")
 
-        def __enter__(self):
-            try:
-                self.conn = duckdb.connect(self.db_path)
-                if self.verbose:
-                    logger.info(f"DuckDB connected to {self.db_path}")
-                return self
-            except Exception as e:
-                logger.error(f"Failed to connect to DuckDB at {self.db_path}: {e}")
-                raise
-
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            if self.conn:
-                self.conn.close()
-                if self.verbose:
-                    logger.info("DuckDB connection closed")
-                self.conn = None
+    def run(
+        self, sql_or_path: str, params: tuple = None, encoding: str = "utf-8"
+    ) -> DataFrame | Iterator[DataFrame] | Path:
+        """
+        Auto-detects if input is a .sql file or raw SQL text.
+        Executes the SQL and returns a Pandas DataFrame.
 
-        def run(
-            self, sql_or_path: str, params: tuple = None, encoding: str = "utf-8"
-        ) -> DataFrame:
-            """
-            Auto-detects if input is a .sql file or raw SQL text.
-            Executes the SQL and returns a Pandas DataFrame.
-            """
-            try:
-                if sql_or_path.strip().lower().endswith(".sql"):
-                    sql_path = Path(sql_or_path)
-                    if sql_path.is_file():
-                        if self.verbose:
-                            logger.info(f"Detected SQL file: {sql_or_path}")
-                        with open(sql_path, "r", encoding=encoding) as f:
-                            sql_text = f.read()
-                    else:
-                        logger.error(f"SQL file not found: {sql_or_path}")
-                        raise FileNotFoundError(f"SQL file not found: {sql_or_path}")
-                else:
+        With a result budget set, a single SELECT is first sized via EXPLAIN and
+        handled according to `on_large_result` if it would exceed the budget.
+        """
+        try:
+            if sql_or_path.strip().lower().endswith(".sql"):
+                sql_path = Path(sql_or_path)
+                if sql_path.is_file():
                     if self.verbose:
-                        logger.info("Detected raw SQL text")
-                    sql_text = sql_or_path
-
-                if not sql_text.strip():
-                    logger.error("Empty SQL query provided")
-                    raise ValueError("SQL query cannot be empty")
-
-                start = time.time()
-                result = (
-                    self.conn.execute(sql_text, params)
-                    if params
-                    else self.conn.execute(sql_text)
-                )
-                result_df = result.df()
-                duration = time.time() - start
-                if self.verbose:
-                    logger.info(
-                        f"Executed SQL - row count: {len(result_df)}, duration: {duration:.2f}s"
+                        logger.info(f"Detected SQL file: {sql_or_path}")
+                    sql_text = _read_sql_file(
+                        str(sql_path.resolve()), sql_path.stat().st_mtime_ns, encoding
                     )
-                return result_df
-            except Exception as e:
-                logger.error(f"Error executing SQL: {e}")
-                raise
+                else:
+                    logger.error(f"SQL file not found: {sql_or_path}")
+                    raise FileNotFoundError(f"SQL file not found: {sql_or_path}")
+            else:
+                if self.verbose:
+                    logger.info("Detected raw SQL text")
+                sql_text = sql_or_path
+
+            if not sql_text.strip():
+                logger.error("Empty SQL query provided")
+                raise ValueError("SQL query cannot be empty")
 
+            if is_single_select(sql_text):
+                estimate = self._over_budget(sql_text, params)
+                if estimate is not None:
+                    return self._run_large(sql_text, params, estimate)
 
-    def main():
-        # Configure logging to output to both console and a file
-        logger.remove()  # Remove default logger
-        logger.add(sys.stderr, level="INFO")  # Console output
-        logger.add("duckdb_runner.log", level="INFO")  # File output
+            start = time.time()
+            result = (
+                self.conn.execute(sql_text, params)
+                if params
+                else self.conn.execute(sql_text)
+            )
+            result_df = result.df()
+            duration = time.time() - start
+            if self.verbose:
+                logger.info(
+                    f"Executed SQL - row count: {len(result_df)}, duration: {duration:.2f}s"
+                )
+            return result_df
+        except Exception as e:
+            logger.error(f"Error executing SQL: {e}")
+            raise
 
-        # Define paths
-        db_path = Path("data/xwines.duckdb")
-        sql_file = Path("sql/rating_outliers.sql")
+    def _over_budget(
+        self,
+        sql_text: str,
+        params: tuple | dict | None,
+        shape: ResultShape | None = None,
+    ) -> int | None:
+        """Estimated result bytes of a SELECT if over the result budget, else None."""
+        if not self.result_budget:
+            return None
+        limit = shape.limit_bound(params) if shape else None
+        if limit is not None and limit * shape.width <= self.result_budget:
+            # Its LIMIT alone keeps it within budget, so there is no need to plan it
+            return None
+        estimate = estimate_result_bytes(self.conn, sql_text, params, shape)
+        if estimate is None or estimate <= self.result_budget:
+            return None
+        return estimate
+
+    def _run_large(
+        self, sql_text: str, params: tuple | dict | None, estimate: int
+    ) -> Iterator[DataFrame] | Path:
+        """Handle a SELECT whose estimated result exceeds the result budget."""
+        message = (
+            f"Estimated result of {estimate:,} bytes exceeds the "
+            f"{self.result_budget:,} byte result budget"
+        )
+        if self.on_large_result == "error":
+            raise ResultTooLargeError(
+                f"{message}; use on_large_result='stream' or 'parquet' to run it"
+            )
+        if self.on_large_result == "stream":
+            logger.warning(f"{message}; streaming DataFrame batches")
+            # A cursor of its own keeps the stream alive while other queries run
+            return fetch_batches(self.conn.cursor().execute(sql_text, params))
+        logger.warning(f"{message}; writing Parquet to {self.results_dir}")
+        name = f"result_{time.strftime('%Y%m%d_%H%M%S')}_{token_hex(4)}.parquet"
+        return write_parquet(self.conn, sql_text, self.results_dir / name, params)
+
+    def run_query(self, name: str, **params) -> DataFrame | Iterator[DataFrame] | Path:
+        """
+        Executes a named query from the query registry with typed parameters
+        and returns a Pandas DataFrame.
+
+        SELECT queries go through the same result-size guard as `run`, with each
+        template's row width and LIMIT clause worked out only once.
+        """
+        try:
+            template = get_registry(self.queries_dir).get(name)
+            bound = template.bind(params)
+            is_select = template.statement.type == duckdb.StatementType.SELECT
+            if is_select and self.result_budget:
+                sql_text = template.statement.query
+                shape = self._template_shape(template, bound)
+                estimate = self._over_budget(sql_text, bound, shape)
+                if estimate is not None:
+                    return self._run_large(sql_text, bound, estimate)
+
+            start = time.time()
+            result_df = self.conn.execute(template.statement, bound).df()
+            duration = time.time() - start
+            if self.verbose:
+                logger.info(
+                    f"Executed query '{name}' - row count: {len(result_df)}, duration: {duration:.2f}s"
+                )
+            return result_df
+        except Exception as e:
+            logger.error(f"Error executing query '{name}': {e}")
+            raise
+
+    def _template_shape(self, template: QueryTemplate, bound: dict) -> ResultShape:
+        """Result shape of a named SELECT query, cached per query."""
+        shape = self._result_shapes.get(template.name)
+        if shape is None:
+            shape = result_shape(self.conn, template.statement.query, bound)
+            self._result_shapes[template.name] = shape
+        return shape
 
-        # Verify that the database file exists
-        if not db_path.exists():
-            logger.error(f"Database file not found: {db_path}")
-            sys.exit(1)
 
-        # Verify that the SQL file exists
-        if not sql_file.exists():
-            logger.error(f"SQL file not found: {sql_file}")
+def main():
+    # Configure logging to output to both console and a file
+    logger.remove()  # Remove default logger
+    logger.add(sys.stderr, level="INFO")  # Console output
+    logger.add("duckdb_runner.log", level="INFO")  # File output
+
+    # Define paths
+    config = load_config()
+    db_path = Path(config.database.path)
+    sql_file = config.database.sql_dir / "rating_outliers.sql"
+
+    # Verify that the database file exists
+    if not db_path.exists():
+        logger.error(f"Database file not found: {db_path}")
+        sys.exit(1)
+
+    # Verify that the SQL file exists
+    if not sql_file.exists():
+        logger.error(f"SQL file not found: {sql_file}")
+        sys.exit(1)
+
+    # Initialise DuckDBRunner with the database path
+    with DuckDBRunner.from_config(log_file="duckdb_runner.log") as runner:
+        try:
+            # Example 1: Run a raw SQL query
+            raw_sql = """
+            SELECT wine_id, rating, user_id
+            FROM ratings
+            WHERE rating IS NOT NULL
+            LIMIT 5;
+            """
+            logger.info("Running raw SQL query...")
+            df_raw = runner.run(raw_sql)
+            logger.info("Raw SQL query results:")
+            print(df_raw)
+
+            # Example 2: Run SQL from file (rating_outliers.sql)
+            logger.info(f"Running SQL file: {sql_file}")
+            df_outliers = runner.run(str(sql_file))
+            logger.info("SQL file query results:")
+            print(df_outliers.head())
+
+        except Exception as e:
+            logger.error(f"Failed to execute query: {e}")
             sys.exit(1)
 
-        # Initialise DuckDBRunner with the database path
-        with DuckDBRunner(db_path=str(db_path), log_file="duckdb_runner.log") as runner:
-            try:
-                # Example 1: Run a raw SQL query
-                raw_sql = """
-                SELECT wine_id, rating, user_id
-                FROM ratings
-                WHERE rating IS NOT NULL
-                LIMIT 5;
-                """
-                logger.info("Running raw SQL query...")
-                df_raw = runner.run(raw_sql)
-                logger.info("Raw SQL query results:")
-                print(df_raw)
-
-                # Example 2: Run SQL from file (rating_outliers.sql)
-                logger.info(f"Running SQL file: {sql_file}")
-                df_outliers = runner.run(str(sql_file))
-                logger.info("SQL file query results:")
-                print(df_outliers.head())
-
-            except Exception as e:
-                logger.error(f"Failed to execute query: {e}")
-                sys.exit(1)
-
-
-    if __name__ == "__main__":
-        main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import duckdb
+from loguru import logger
+from pandas import DataFrame
+
+# Approximate in-memory bytes per value once fetched into pandas
+_TYPE_WIDTHS = {
+    "BOOLEAN": 1,
+    "TINYINT": 1,
+    "SMALLINT": 2,
+    "INTEGER": 4,
+    "BIGINT": 8,
+    "HUGEINT": 16,
+    "FLOAT": 4,
+    "DOUBLE": 8,
+    "DATE": 8,
+    "TIMESTAMP": 8,
+    "VARCHAR": 64,
+}
+_DEFAULT_WIDTH = 16
+
+_LIMIT_OPERATORS = ("LIMIT", "STREAMING_LIMIT", "TOP_N")
+
+
+class ResultTooLargeError(RuntimeError):
+    """Raised when a query's estimated result exceeds the memory budget."""
+
+
+def _estimated_rows(node: dict) -> int | None:
+    """Estimated cardinality of the operator producing the plan's result."""
+    name, extra = node.get("name"), node.get("extra_info", {})
+    if name in _LIMIT_OPERATORS and "Top" in extra:
+        return int(extra["Top"])
+    rows = int(extra.get("Estimated Cardinality", 0))
+    if rows:
+        return rows
+    # DuckDB reports 0 on some operators (the projection above an ORDER_BY, the
+    # join of a late-materialised TOP_N) and nothing on limits other than TOP_N,
+    # so fall back to the input's estimate: an upper bound that
+    # estimate_result_bytes then caps with the LIMIT clause.
+    children = node.get("children", [])
+    if not children:
+        return None
+    # A CTE node materialises its first children; the last one is the query itself
+    return _estimated_rows(children[-1] if name == "CTE" else children[0])
+
+
+@dataclass(frozen=True)
+class ResultShape:
+    """
+    The parameter-independent part of a SELECT's size estimate: its output row
+    width and top-level LIMIT clause. It only changes with the SQL text and schema,
+    so it can be worked out once per query template.
+    """
+
+    width: int
+    # Constant row bound, parameter name or position, or None without a LIMIT
+    limit: int | str | None
+
+    def limit_bound(self, params: dict | list | None) -> int | None:
+        """Row bound of the LIMIT clause for the given parameters, if any."""
+        if not isinstance(self.limit, str):
+            return self.limit
+        if not params:
+            return None
+        try:
+            if isinstance(params, dict):
+                return int(params[self.limit])
+            return int(params[int(self.limit) - 1])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+
+
+def _limit_clause(conn: duckdb.DuckDBPyConnection, sql: str) -> int | str | None:
+    """A SELECT's top-level LIMIT: a constant, a parameter identifier or None."""
+    tree = json.loads(conn.execute("SELECT json_serialize_sql(?)", [sql]).fetchone()[0])
+    if tree.get("error"):
+        return None
+    modifiers = tree["statements"][0]["node"].get("modifiers", [])
+    limit = next((m["limit"] for m in modifiers if m["type"] == "LIMIT_MODIFIER"), None)
+    if limit is None:
+        return None
+    if limit["class"] == "CONSTANT":
+        return limit["value"]["value"]
+    if limit["class"] == "PARAMETER":
+        return limit["identifier"]
+    return None
+
+
+def result_shape(
+    conn: duckdb.DuckDBPyConnection, sql: str, params: dict | list | None = None
+) -> ResultShape:
+    """
+    Work out a SELECT's output row width (from its column types) and LIMIT clause.
+
+    :param conn: DuckDB connection
+    :param sql: A single SELECT statement
+    :param params: Parameters for the statement, if any
+    :return: The statement's ResultShape
+    """
+    columns = conn.execute(f"DESCRIBE {sql}", params).fetchall()
+    width = sum(_TYPE_WIDTHS.get(column[1], _DEFAULT_WIDTH) for column in columns)
+    return ResultShape(width=width, limit=_limit_clause(conn, sql))
+
+
+def estimate_result_bytes(
+    conn: duckdb.DuckDBPyConnection,
+    sql: str,
+    params: dict | list | None = None,
+    shape: ResultShape | None = None,
+) -> int | None:
+    """
+    Estimate the in-memory size of a SELECT's result from its EXPLAIN plan and
+    output column types, without running it.
+
+    :param conn: DuckDB connection
+    :param sql: A single SELECT statement
+    :param params: Parameters for the statement, if any
+    :param shape: The statement's ResultShape if already known
+    :return: Estimated bytes, or None when the planner gives no estimate
+    """
+    shape = shape or result_shape(conn, sql, params)
+    plan = conn.execute(f"EXPLAIN (FORMAT json) {sql}", params).fetchall()[0][1]
+    rows = _estimated_rows(json.loads(plan)[0])
+    if rows is None:
+        return None
+    limit = shape.limit_bound(params)
+    if limit is not None:
+        rows = min(rows, limit)
+    return rows * shape.width
+
+
+def is_single_select(sql: str) -> bool:
+    """Whether the SQL text is exactly one SELECT statement (and so can be estimated)."""
+    try:
+        statements = duckdb.extract_statements(sql)
+    except duckdb.ParserException:
+        return False
+    return len(statements) == 1 and statements[0].type == duckdb.StatementType.SELECT
+
+
+def fetch_batches(
+    result: duckdb.DuckDBPyConnection, rows_per_batch: int = 1_000_000
+) -> Iterator[DataFrame]:
+    """
+    Yield an executed result as DataFrames of at most about rows_per_batch rows.
+
+    `result` should be a cursor of its own (`conn.cursor().execute(...)`): it is
+    closed once the batches are exhausted or the iterator is closed.
+    """
+    chunks_per_batch = max(1, rows_per_batch // 2048)  # DuckDB vectors hold 2048 rows
+    try:
+        while True:
+            batch = result.fetch_df_chunk(chunks_per_batch)
+            if batch.empty:
+                return
+            yield batch
+    finally:
+        result.close()
+
+
+def write_parquet(
+    conn: duckdb.DuckDBPyConnection,
+    sql: str,
+    path: Path,
+    params: dict | list | None = None,
+) -> Path:
+    """Write a SELECT's result straight to a Parquet file, without materialising it."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A relation copes with trailing semicolons and comments that would break
+    # splicing the SQL text into a COPY statement
+    conn.sql(sql, params=params).to_parquet(str(path))
+    logger.info(f"Wrote query result to {path}")
+    return path
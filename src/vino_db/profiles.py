@@ -0,0 +1,73 @@
+import re
+from dataclasses import dataclass, field
+
+# Kept free of duckdb and pandas so the config layer can validate profiles and
+# sizes without loading the database stack.
+
+
+@dataclass(frozen=True)
+class ExecutionProfile:
+    """DuckDB spilling/parallelism settings plus the memory budget for results."""
+
+    settings: dict[str, str | int | bool] = field(default_factory=dict)
+    result_budget: str | None = None
+
+
+EXECUTION_PROFILES = {
+    # Leave headroom for the notebook/pandas side and spill sorts and joins early
+    "laptop": ExecutionProfile(
+        settings={
+            "threads": 4,
+            "memory_limit": "4GB",
+            "max_temp_directory_size": "50GB",
+            "preserve_insertion_order": False,
+        },
+        result_budget="1GB",
+    ),
+    # Use every core and DuckDB's default memory limit (80% of RAM)
+    "server": ExecutionProfile(
+        settings={"preserve_insertion_order": False},
+        result_budget="16GB",
+    ),
+}
+
+LARGE_RESULT_ACTIONS = ("error", "stream", "parquet")
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]i?B|B)?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"B": 1, "KB": 1000, "MB": 1000**2, "GB": 1000**3, "TB": 1000**4}
+_SIZE_UNITS.update({"KIB": 1024, "MIB": 1024**2, "GIB": 1024**3, "TIB": 1024**4})
+
+
+def parse_size(size: str | int) -> int:
+    """Convert a DuckDB-style size ('4GB', '512MiB') or a byte count to bytes."""
+    if isinstance(size, int):
+        return size
+    match = _SIZE_PATTERN.match(size)
+    if not match:
+        raise ValueError(f"Invalid size: '{size}'")
+    value, unit = match.groups()
+    return int(float(value) * _SIZE_UNITS[(unit or "B").upper()])
+
+
+def get_profile(name: str) -> ExecutionProfile:
+    """Look up an execution profile by name."""
+    if name not in EXECUTION_PROFILES:
+        raise ValueError(
+            f"Unknown execution profile '{name}'. Available: {', '.join(EXECUTION_PROFILES)}"
+        )
+    return EXECUTION_PROFILES[name]
+
+
+def execution_settings(
+    profile: str | None = None, overrides: dict | None = None
+) -> dict[str, str | int | bool]:
+    """
+    DuckDB settings for a profile, with explicit values taking precedence.
+
+    :param profile: Profile name (see EXECUTION_PROFILES), or None for DuckDB defaults.
+    :param overrides: Explicit settings, e.g. from `VinoConfig.duckdb_config()`.
+    :return: Settings to pass as `config=` to `duckdb.connect`
+    """
+    settings = dict(get_profile(profile).settings) if profile else {}
+    settings.update(overrides or {})
+    return settings
@@ -0,0 +1,195 @@
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+import duckdb
+from loguru import logger
+
+# Public read-only lookups served by the CLI and the query service
+QUERIES_DIR = Path("sql/queries")
+# Write templates used internally when loading data; never exposed to callers
+LOADERS_DIR = Path("sql/loaders")
+
+_PARAM_PATTERN = re.compile(r"^--\s*:param\s+(\w+)\s*:\s*(\w+)\s*$")
+
+
+def _to_int(value) -> int:
+    if isinstance(value, bool):
+        raise TypeError("boolean is not an integer")
+    return int(value)
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, str):
+        if value.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(f"not a boolean: {value}")
+        return value.lower() in ("true", "1")
+    return bool(value)
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _to_datetime(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(value)
+
+
+# Declared SQL parameter types and the Python conversion applied before binding
+PARAM_TYPES = {
+    "INTEGER": _to_int,
+    "BIGINT": _to_int,
+    "DOUBLE": float,
+    "VARCHAR": str,
+    "BOOLEAN": _to_bool,
+    "DATE": _to_date,
+    "TIMESTAMP": _to_datetime,
+}
+
+
+@dataclass(frozen=True)
+class QueryTemplate:
+    """A named SQL template with typed `$name` parameters, parsed once."""
+
+    name: str
+    description: str
+    params: dict[str, str]
+    sql: str
+    statement: duckdb.Statement
+
+    def bind(self, params: dict) -> dict:
+        """
+        Check and convert parameter values against the declared types.
+
+        :param params: Parameter values by name
+        :return: Converted values, ready to bind to the statement
+        """
+        missing = self.params.keys() - params.keys()
+        unexpected = params.keys() - self.params.keys()
+        if missing or unexpected:
+            raise ValueError(
+                f"Query '{self.name}' expects parameters {sorted(self.params)}; "
+                f"missing: {sorted(missing)}, unexpected: {sorted(unexpected)}"
+            )
+        bound = {}
+        for name, sql_type in self.params.items():
+            try:
+                bound[name] = PARAM_TYPES[sql_type](params[name])
+            except (TypeError, ValueError) as e:
+                raise ValueError(
+                    f"Invalid value for parameter '{name}' ({sql_type}) of query '{self.name}': {e}"
+                )
+        return bound
+
+
+def parse_template(name: str, sql: str) -> QueryTemplate:
+    """
+    Parse a template: leading `-- :param name: TYPE` comments declare parameters
+    and other leading comments form the description.
+
+    :param name: Query name
+    :param sql: Template text containing exactly one statement
+    :return: QueryTemplate instance
+    """
+    description, params = [], {}
+    for line in sql.splitlines():
+        line = line.strip()
+        if not line.startswith("--"):
+            break
+        match = _PARAM_PATTERN.match(line)
+        if match:
+            param, sql_type = match.group(1), match.group(2).upper()
+            if sql_type not in PARAM_TYPES:
+                raise ValueError(
+                    f"Unsupported type '{sql_type}' for parameter '{param}' in query '{name}'"
+                )
+            params[param] = sql_type
+        else:
+            description.append(line.lstrip("-").strip())
+
+    statements = duckdb.extract_statements(sql)
+    if len(statements) != 1:
+        raise ValueError(f"Query '{name}' must contain exactly one statement")
+    statement = statements[0]
+    if set(statement.named_parameters) != params.keys():
+        raise ValueError(
+            f"Query '{name}' declares parameters {sorted(params)} but uses "
+            f"{sorted(statement.named_parameters)}"
+        )
+    return QueryTemplate(
+        name=name,
+        description=" ".join(description),
+        params=params,
+        sql=sql,
+        statement=statement,
+    )
+
+
+class QueryRegistry:
+    """
+    Named query templates loaded once from a directory of `.sql` files.
+
+    Templates are parsed when the registry is created, so executing a query does
+    no file I/O or SQL parsing, and values are always bound as parameters,
+    never interpolated into the SQL text.
+    """
+
+    def __init__(self, queries_dir: Path = QUERIES_DIR):
+        """
+        :param queries_dir: Directory of `<name>.sql` templates.
+        """
+        self.queries_dir = Path(queries_dir)
+        if not self.queries_dir.is_dir():
+            raise FileNotFoundError(f"Query directory not found: {self.queries_dir}")
+        self.templates = {
+            path.stem: parse_template(path.stem, path.read_text(encoding="utf-8"))
+            for path in sorted(self.queries_dir.glob("*.sql"))
+        }
+        logger.debug(
+            f"Loaded {len(self.templates)} query templates from {self.queries_dir}"
+        )
+
+    def names(self) -> list[str]:
+        """Names of the available queries."""
+        return list(self.templates)
+
+    def get(self, name: str) -> QueryTemplate:
+        """Look up a query template by name."""
+        template = self.templates.get(name)
+        if template is None:
+            raise KeyError(
+                f"Query '{name}' not found. Available: {', '.join(self.templates)}"
+            )
+        return template
+
+    def execute(
+        self, conn: duckdb.DuckDBPyConnection, name: str, **params
+    ) -> duckdb.DuckDBPyConnection:
+        """
+        Execute a named query with validated parameters.
+
+        :param conn: DuckDB connection (or cursor) to execute on
+        :param name: Query name
+        :param params: Parameter values by name
+        :return: The connection, ready to fetch results from
+        """
+        template = self.get(name)
+        return conn.execute(template.statement, template.bind(params))
+
+
+@lru_cache(maxsize=4)
+def _get_registry(queries_dir: str) -> QueryRegistry:
+    return QueryRegistry(Path(queries_dir))
+
+
+def get_registry(queries_dir: str | Path = QUERIES_DIR) -> QueryRegistry:
+    """Process-wide registry per directory, so templates are loaded only once."""
+    return _get_registry(str(Path(queries_dir).resolve()))
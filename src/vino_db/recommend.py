@@ -0,0 +1,349 @@
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import duckdb
+from loguru import logger
+from pandas import DataFrame
+
+from vino_db.profiles import parse_size
+
+SIMILARITY_METHODS = ("cosine", "adjusted_cosine")
+
+# Size settings that bound the whole build, so are split between worker processes
+_SHARED_SIZE_SETTINGS = ("memory_limit", "max_temp_directory_size")
+
+_BLOCK_SQL = """
+    WITH block AS (
+        SELECT wine_id, user_id, value
+        FROM wine_vectors
+        WHERE wine_id BETWEEN ? AND ?
+    ),
+    pairs AS (
+        SELECT
+            b.wine_id,
+            v.wine_id AS neighbour_id,
+            SUM(b.value * v.value) AS dot,
+            COUNT(*) AS support
+        FROM block b
+        JOIN wine_vectors v ON v.user_id = b.user_id AND v.wine_id <> b.wine_id
+        GROUP BY b.wine_id, v.wine_id
+        HAVING COUNT(*) >= ?
+    )
+    SELECT
+        p.wine_id,
+        p.neighbour_id,
+        p.dot / (ni.norm * nj.norm) AS similarity,
+        p.support
+    FROM pairs p
+    JOIN wine_norms ni ON ni.wine_id = p.wine_id
+    JOIN wine_norms nj ON nj.wine_id = p.neighbour_id
+    WHERE ni.norm > 0 AND nj.norm > 0
+    QUALIFY row_number() OVER (
+        PARTITION BY p.wine_id ORDER BY similarity DESC, p.neighbour_id
+    ) <= ?
+"""
+
+
+def _score_block(
+    conn: duckdb.DuckDBPyConnection, bounds: tuple[int, int], k: int, min_support: int
+) -> DataFrame:
+    """Top-k neighbours for every wine with an id inside the inclusive bounds."""
+    return conn.execute(_BLOCK_SQL, [bounds[0], bounds[1], min_support, k]).df()
+
+
+# DuckDB settings of the current worker process, set by _init_worker
+_worker_config: dict = {}
+
+
+def _init_worker(duckdb_config: dict, spill_root: str):
+    """
+    Process-pool initializer. DuckDB names its spill files the same way in every
+    process, so each worker spills into its own directory under spill_root.
+    """
+    global _worker_config
+    temp_directory = os.path.join(spill_root, f"worker-{os.getpid()}")
+    _worker_config = {**duckdb_config, "temp_directory": temp_directory}
+
+
+def _score_block_worker(
+    db_path: str, bounds: tuple[int, int], k: int, min_support: int
+) -> DataFrame:
+    """Process-pool entry point: scores one block on its own read-only connection."""
+    conn = duckdb.connect(db_path, read_only=True, config=_worker_config)
+    try:
+        return _score_block(conn, bounds, k, min_support)
+    finally:
+        conn.close()
+
+
+class WineRecommender:
+    """
+    Item-item collaborative filtering over the ratings table.
+
+    The build step materialises the top-k most similar wines for every wine in a
+    `wine_neighbours` table; serving queries then only touch that table and the
+    ratings of a single user, so they stay fast regardless of the ratings volume.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/xwines.duckdb",
+        read_only: bool = False,
+        duckdb_config: dict | None = None,
+    ):
+        """
+        :param db_path: DuckDB database path or ':memory:' for in-memory DB.
+        :param read_only: Open the database read-only (serving only, no build).
+        :param duckdb_config: DuckDB settings, e.g. from `VinoConfig.duckdb_config()`.
+        """
+        self.db_path = db_path
+        self.read_only = read_only
+        self.duckdb_config = duckdb_config or {}
+        self.conn = duckdb.connect(
+            self.db_path, read_only=read_only, config=self.duckdb_config
+        )
+
+    def build_neighbours(
+        self,
+        k: int = 50,
+        method: str = "adjusted_cosine",
+        min_support: int = 3,
+        block_size: int = 2000,
+        workers: int | None = None,
+    ) -> int:
+        """
+        Compute item-item similarities and keep the top-k neighbours per wine.
+
+        Ratings are collapsed to one value per (user, wine) and the wines are split
+        into blocks of consecutive ids that are scored independently, in parallel
+        processes when the database is file-backed.
+
+        :param k: Number of neighbours to keep per wine.
+        :param method: 'cosine' on raw ratings or 'adjusted_cosine' on ratings
+            centred by each user's mean rating.
+        :param min_support: Minimum number of users who rated both wines.
+        :param block_size: Number of wines scored per block.
+        :param workers: Number of worker processes (defaults to the configured
+            thread count, else the CPU count). Threads, memory and spill limits
+            are divided between them.
+        :return: Number of rows written to `wine_neighbours`.
+        """
+        if method not in SIMILARITY_METHODS:
+            raise ValueError(
+                f"Unknown similarity method '{method}'. Available: {', '.join(SIMILARITY_METHODS)}"
+            )
+        if self.read_only:
+            raise RuntimeError("Cannot build neighbours on a read-only connection")
+        if k < 1 or block_size < 1:
+            raise ValueError("k and block_size must be positive")
+
+        start = time.time()
+        try:
+            self._prepare_vectors(method)
+            bounds = self._block_bounds(block_size)
+            workers = workers or self._total_threads()
+            logger.info(
+                f"Scoring {len(bounds)} blocks of up to {block_size} wines ({method}, k={k})"
+            )
+
+            if workers > 1 and len(bounds) > 1 and self.db_path != ":memory:":
+                blocks = self._score_blocks_parallel(bounds, k, min_support, workers)
+            else:
+                blocks = [_score_block(self.conn, b, k, min_support) for b in bounds]
+
+            self.conn.execute("""
+                CREATE OR REPLACE TABLE wine_neighbours (
+                    wine_id INTEGER NOT NULL,
+                    neighbour_id INTEGER NOT NULL,
+                    similarity DOUBLE NOT NULL,
+                    support INTEGER NOT NULL
+                );
+            """)
+            for block_df in blocks:
+                if block_df.empty:
+                    continue
+                self.conn.register("block_df", block_df)
+                self.conn.execute("INSERT INTO wine_neighbours SELECT * FROM block_df")
+                self.conn.unregister("block_df")
+            self.conn.execute(
+                "CREATE INDEX wine_neighbours_wine_idx ON wine_neighbours (wine_id)"
+            )
+            # Per-user lookups at serving time would otherwise scan the full ratings table
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS ratings_user_idx ON ratings (user_id)"
+            )
+        finally:
+            self.conn.execute("DROP TABLE IF EXISTS wine_vectors")
+            self.conn.execute("DROP TABLE IF EXISTS wine_norms")
+
+        row_count = self.conn.execute(
+            "SELECT COUNT(*) FROM wine_neighbours"
+        ).fetchone()[0]
+        logger.info(
+            f"Built wine_neighbours - row count: {row_count}, duration: {time.time() - start:.2f}s"
+        )
+        return row_count
+
+    def _prepare_vectors(self, method: str):
+        """Stage one (optionally user-centred) value per (user, wine) plus wine norms."""
+        centre = (
+            "AVG(rating) OVER (PARTITION BY user_id)"
+            if method == "adjusted_cosine"
+            else "0"
+        )
+        self.conn.execute(f"""
+            CREATE OR REPLACE TABLE wine_vectors AS
+            WITH user_wine AS (
+                SELECT user_id, wine_id, AVG(rating) AS rating
+                FROM ratings
+                GROUP BY user_id, wine_id
+            )
+            SELECT wine_id, user_id, rating - {centre} AS value
+            FROM user_wine
+            ORDER BY wine_id;
+        """)
+        self.conn.execute("""
+            CREATE OR REPLACE TABLE wine_norms AS
+            SELECT wine_id, SQRT(SUM(value * value)) AS norm
+            FROM wine_vectors
+            GROUP BY wine_id;
+        """)
+
+    def _block_bounds(self, block_size: int) -> list[tuple[int, int]]:
+        """Inclusive (first, last) wine_id bounds of each block of rated wines."""
+        rows = self.conn.execute(
+            """
+            SELECT MIN(wine_id), MAX(wine_id)
+            FROM (
+                SELECT wine_id, (row_number() OVER (ORDER BY wine_id) - 1) // ? AS block
+                FROM wine_norms
+            )
+            GROUP BY block
+            ORDER BY block
+            """,
+            [block_size],
+        ).fetchall()
+        return [(lo, hi) for lo, hi in rows]
+
+    def _total_threads(self) -> int:
+        """Threads available to the whole build: the configured count, else all CPUs."""
+        return self.duckdb_config.get("threads") or os.cpu_count() or 1
+
+    def _score_blocks_parallel(
+        self,
+        bounds: list[tuple[int, int]],
+        k: int,
+        min_support: int,
+        workers: int,
+    ) -> list[DataFrame]:
+        """Score blocks in worker processes, each with its own read-only connection."""
+        # DuckDB allows many read-only processes or a single writer, so release
+        # the write lock while the workers run and reacquire it afterwards.
+        self.conn.execute("CHECKPOINT")
+        self.conn.close()
+        worker_config = {
+            **self.duckdb_config,
+            "threads": max(1, self._total_threads() // workers),
+        }
+        for setting in _SHARED_SIZE_SETTINGS:
+            if setting in self.duckdb_config:
+                share = parse_size(self.duckdb_config[setting]) // workers
+                worker_config[setting] = f"{share}B"
+        # Without a configured temp_directory DuckDB spills to <database>.tmp
+        spill_base = Path(
+            self.duckdb_config.get("temp_directory") or f"{self.db_path}.tmp"
+        )
+        created_base = not spill_base.exists()
+        spill_base.mkdir(parents=True, exist_ok=True)
+        spill_root = tempfile.mkdtemp(prefix="neighbours-", dir=spill_base)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(worker_config, spill_root),
+            ) as pool:
+                futures = [
+                    pool.submit(_score_block_worker, self.db_path, b, k, min_support)
+                    for b in bounds
+                ]
+                return [f.result() for f in futures]
+        finally:
+            shutil.rmtree(spill_root, ignore_errors=True)
+            if created_base:
+                shutil.rmtree(spill_base, ignore_errors=True)
+            self.conn = duckdb.connect(self.db_path, config=self.duckdb_config)
+
+    def similar_wines(self, wine_id: int, n: int = 10) -> DataFrame:
+        """
+        Return the n wines most similar to the given wine.
+
+        :param wine_id: Wine to find neighbours for.
+        :param n: Maximum number of wines to return.
+        :return: DataFrame of neighbour ids, names and similarity scores.
+        """
+        return self.conn.execute(
+            """
+            SELECT n.neighbour_id AS wine_id, w.wine_name, w.winery_name, n.similarity, n.support
+            FROM wine_neighbours n
+            LEFT JOIN wines w ON w.wine_id = n.neighbour_id
+            WHERE n.wine_id = ?
+            ORDER BY n.similarity DESC, n.neighbour_id
+            LIMIT ?
+            """,
+            [wine_id, n],
+        ).df()
+
+    def recommend_for_user(
+        self, user_id: int, n: int = 10, shrinkage: float = 1.0
+    ) -> DataFrame:
+        """
+        Return the top-n unrated wines for a user, scored by the similarity-weighted
+        average of the user's ratings of each candidate's neighbours.
+
+        The shrinkage term is added to the sum of similarities, pulling scores
+        backed by little evidence towards 0 so that a candidate reached through a
+        single neighbour of one top-rated wine does not rank first by default.
+
+        :param user_id: User to recommend wines for.
+        :param n: Maximum number of wines to return.
+        :param shrinkage: Similarity mass added to each score's denominator.
+        :return: DataFrame of wine ids, names and predicted scores.
+        """
+        if shrinkage < 0:
+            raise ValueError("shrinkage must not be negative")
+        return self.conn.execute(
+            """
+            WITH history AS (
+                SELECT wine_id, AVG(rating) AS rating
+                FROM ratings
+                WHERE user_id = ?
+                GROUP BY wine_id
+            ),
+            candidates AS (
+                SELECT
+                    n.neighbour_id AS wine_id,
+                    SUM(n.similarity * h.rating) / (SUM(ABS(n.similarity)) + ?) AS score,
+                    COUNT(*) AS evidence
+                FROM history h
+                JOIN wine_neighbours n ON n.wine_id = h.wine_id
+                WHERE n.similarity > 0
+                  AND n.neighbour_id NOT IN (SELECT wine_id FROM history)
+                GROUP BY n.neighbour_id
+            )
+            SELECT c.wine_id, w.wine_name, w.winery_name, c.score, c.evidence
+            FROM candidates c
+            LEFT JOIN wines w ON w.wine_id = c.wine_id
+            ORDER BY c.score DESC, c.evidence DESC, c.wine_id
+            LIMIT ?
+            """,
+            [user_id, shrinkage, n],
+        ).df()
+
+    def close(self):
+        """Close DuckDB connection."""
+        self.conn.close()
+        logger.info("Database connection closed.")
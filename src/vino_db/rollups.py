@@ -0,0 +1,251 @@
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import duckdb
+from loguru import logger
+from pandas import DataFrame
+
+from vino_db.queries import LOADERS_DIR, get_registry
+
+# Wine attributes every rollup row is keyed by, next to its time bucket
+ROLLUP_KEYS = ("type", "country", "region_name")
+
+# Stored rollups by DuckDB date_trunc part, finest first
+ROLLUP_TABLES = {
+    "day": "ratings_rollup_day",
+    "month": "ratings_rollup_month",
+}
+
+# Output granularities and the coarsest stored rollup each can be derived from
+GRANULARITIES = {
+    "day": "day",
+    "week": "day",
+    "month": "month",
+    "quarter": "month",
+    "year": "month",
+}
+
+
+def _delta_sql(source: str, granularity: str) -> str:
+    """Aggregate rating rows of `source` (with wine_id, rating, rating_date) per bucket and key."""
+    keys = ", ".join(f"w.{k}" for k in ROLLUP_KEYS)
+    return f"""
+        SELECT
+            date_trunc('{granularity}', r.rating_date)::DATE AS bucket,
+            {keys},
+            COUNT(*) AS rating_count,
+            SUM(r.rating) AS rating_sum,
+            SUM(r.rating * r.rating) AS rating_sum_sq
+        FROM {source} r
+        JOIN wines w ON w.wine_id = r.wine_id
+        WHERE r.rating_date IS NOT NULL
+        GROUP BY ALL
+    """
+
+
+def build_rollups(conn: duckdb.DuckDBPyConnection):
+    """
+    (Re)build the day and month rollups of the ratings table.
+
+    Each rollup row holds the count, sum and sum of squares of the ratings in one
+    time bucket for one (type, country, region_name), so means and standard
+    deviations can be recombined exactly at any coarser level.
+
+    :param conn: Writable DuckDB connection.
+    """
+    start = time.time()
+    for granularity, table in ROLLUP_TABLES.items():
+        conn.execute(f"""
+            CREATE OR REPLACE TABLE {table} AS
+            {_delta_sql("ratings", granularity)}
+            ORDER BY bucket;
+        """)
+    logger.info(f"Built ratings rollups, duration: {time.time() - start:.2f}s")
+
+
+def rollups_exist(conn: duckdb.DuckDBPyConnection) -> bool:
+    """Whether the rollup tables have been built in this database."""
+    found = conn.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name IN ?",
+        [list(ROLLUP_TABLES.values())],
+    ).fetchone()[0]
+    return found == len(ROLLUP_TABLES)
+
+
+def update_rollups(conn: duckdb.DuckDBPyConnection, source: str):
+    """
+    Fold newly appended ratings into the rollups without rescanning the ratings table.
+
+    Must run in the same transaction as the insert into `ratings`, so that the
+    rollups never count a rating twice or miss one.
+
+    :param conn: Writable DuckDB connection.
+    :param source: Table or view holding only the new ratings.
+    """
+    match = " AND ".join(
+        ["t.bucket = d.bucket"]
+        + [f"t.{k} IS NOT DISTINCT FROM d.{k}" for k in ROLLUP_KEYS]
+    )
+    for granularity, table in ROLLUP_TABLES.items():
+        conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE rollup_delta AS {_delta_sql(source, granularity)}"
+        )
+        conn.execute(f"""
+            UPDATE {table} t
+            SET rating_count = t.rating_count + d.rating_count,
+                rating_sum = t.rating_sum + d.rating_sum,
+                rating_sum_sq = t.rating_sum_sq + d.rating_sum_sq
+            FROM rollup_delta d
+            WHERE {match};
+        """)
+        conn.execute(f"""
+            INSERT INTO {table}
+            SELECT d.* FROM rollup_delta d
+            WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {match});
+        """)
+    conn.execute("DROP TABLE rollup_delta")
+
+
+def append_ratings(
+    conn: duckdb.DuckDBPyConnection,
+    ratings_csv: str | Path,
+    loaders_dir: str | Path = LOADERS_DIR,
+) -> int:
+    """
+    Append a ratings CSV (same layout as the X-Wines ratings file), adding any new
+    users, and fold the new ratings into the rollups in one transaction.
+
+    If any rating cannot be inserted (e.g. a duplicate rating_id), nothing is
+    appended and the rollups are left as they were.
+
+    :param conn: Writable DuckDB connection.
+    :param ratings_csv: Path to the ratings CSV.
+    :param loaders_dir: Directory holding the loader templates.
+    :return: Number of ratings appended.
+    """
+    queries = get_registry(loaders_dir)
+    try:
+        conn.execute(
+            "CREATE OR REPLACE TEMP TABLE new_ratings AS SELECT * FROM ratings LIMIT 0"
+        )
+        logger.info("Staging ratings CSV...")
+        queries.execute(conn, "stage_ratings", path=str(ratings_csv))
+        conn.begin()
+        try:
+            conn.execute("""
+                INSERT INTO users
+                SELECT DISTINCT user_id FROM new_ratings
+                WHERE user_id NOT IN (SELECT user_id FROM users);
+            """)
+            row_count = conn.execute(
+                "INSERT INTO ratings SELECT * FROM new_ratings"
+            ).fetchone()[0]
+            if rollups_exist(conn):
+                update_rollups(conn, "new_ratings")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    finally:
+        conn.execute("DROP TABLE IF EXISTS new_ratings")
+    logger.info(f"Appended {row_count} ratings")
+    return row_count
+
+
+def _as_date(value: date | datetime | str | None) -> date | None:
+    if value is None or (isinstance(value, date) and not isinstance(value, datetime)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value != datetime(value.year, value.month, value.day):
+        raise ValueError("Rollup date bounds must be whole days")
+    return value.date()
+
+
+def choose_rollup(
+    granularity: str, start: date | None = None, end: date | None = None
+) -> str:
+    """
+    Pick the coarsest rollup table that can answer a query exactly.
+
+    The month rollup is used when the output granularity is a month or coarser
+    and both bounds (if given) fall on the first of a month; otherwise the day
+    rollup is used.
+
+    :param granularity: Output granularity (day, week, month, quarter or year).
+    :param start: Inclusive start date, or None.
+    :param end: Exclusive end date, or None.
+    :return: Rollup table name.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(
+            f"Unknown granularity '{granularity}'. Available: {', '.join(GRANULARITIES)}"
+        )
+    rollup = GRANULARITIES[granularity]
+    if rollup == "month" and any(d is not None and d.day != 1 for d in (start, end)):
+        rollup = "day"
+    return ROLLUP_TABLES[rollup]
+
+
+def rating_trends(
+    conn: duckdb.DuckDBPyConnection,
+    granularity: str = "month",
+    start: date | datetime | str | None = None,
+    end: date | datetime | str | None = None,
+    group_by: tuple[str, ...] = (),
+    filters: dict[str, str] | None = None,
+) -> DataFrame:
+    """
+    Rating volume, mean and standard deviation over time, answered from the rollups.
+
+    :param conn: DuckDB connection to a database with the rollups built.
+    :param granularity: Output granularity (day, week, month, quarter or year).
+    :param start: Inclusive start date, or None for no lower bound.
+    :param end: Exclusive end date, or None for no upper bound.
+    :param group_by: Wine attributes to break the series down by (see ROLLUP_KEYS).
+    :param filters: Exact-match filters on wine attributes, e.g. {"country": "France"}.
+    :return: DataFrame with one row per bucket (and group).
+    """
+    if not rollups_exist(conn):
+        raise ValueError("Ratings rollups have not been built; run build-rollups first")
+    filters = filters or {}
+    unknown = (set(group_by) | filters.keys()) - set(ROLLUP_KEYS)
+    if unknown:
+        raise ValueError(
+            f"Unknown rollup keys {sorted(unknown)}. Available: {', '.join(ROLLUP_KEYS)}"
+        )
+    start, end = _as_date(start), _as_date(end)
+    table = choose_rollup(granularity, start, end)
+
+    conditions, params = [], []
+    if start is not None:
+        conditions.append("bucket >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("bucket < ?")
+        params.append(end)
+    for key, value in filters.items():
+        conditions.append(f"{key} = ?")
+        params.append(value)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    groups = "".join(f", {k}" for k in group_by)
+
+    return conn.execute(
+        f"""
+        SELECT
+            date_trunc('{granularity}', bucket)::DATE AS period{groups},
+            SUM(rating_count)::BIGINT AS rating_count,
+            SUM(rating_sum) / SUM(rating_count) AS mean_rating,
+            SQRT(GREATEST(
+                SUM(rating_sum_sq) / SUM(rating_count)
+                - POW(SUM(rating_sum) / SUM(rating_count), 2),
+                0
+            )) AS stddev_rating
+        FROM {table}
+        {where}
+        GROUP BY ALL
+        ORDER BY period{groups}
+        """,
+        params,
+    ).df()
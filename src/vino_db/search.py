@@ -0,0 +1,120 @@
+import time
+
+import duckdb
+from loguru import logger
+from pandas import DataFrame
+
+SEARCH_FIELDS = ("wine_name", "winery_name", "region_name")
+
+# Padded, accent-folded trigrams of every alphanumeric token, as in pg_trgm:
+# 'Merlot' -> ['  m', ' me', 'mer', 'erl', 'rlo', 'lot', 'ot ']
+_TRIGRAMS_SQL = """
+    list_distinct(flatten(list_transform(
+        list_filter(regexp_split_to_array(lower(strip_accents({text})), '[^a-z0-9]+'), t -> t <> ''),
+        t -> list_transform(range(1, length(t) + 2), i -> substring('  ' || t || ' ', i, 3))
+    )))
+"""
+
+
+def build_search_index(conn: duckdb.DuckDBPyConnection) -> int:
+    """
+    (Re)build the trigram index used by `search_wines` from the wines table.
+
+    The index is a plain table holding one posting list of wine ids per trigram,
+    so it needs no extension and a search only reads the postings of the query's
+    trigrams.
+
+    :param conn: Writable DuckDB connection.
+    :return: Number of distinct trigrams in the index.
+    """
+    start = time.time()
+    text = "concat_ws(' ', " + ", ".join(SEARCH_FIELDS) + ")"
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE wine_trigram_pairs AS
+        SELECT DISTINCT unnest({_TRIGRAMS_SQL.format(text=text)}) AS trigram, wine_id
+        FROM wines;
+    """)
+    conn.execute("""
+        CREATE OR REPLACE TABLE wine_trigrams AS
+        SELECT trigram, list(wine_id ORDER BY wine_id) AS wine_ids
+        FROM wine_trigram_pairs
+        GROUP BY trigram
+        ORDER BY trigram;
+    """)
+    conn.execute("""
+        CREATE OR REPLACE TABLE wine_trigram_counts AS
+        SELECT wine_id, COUNT(*) AS trigram_count
+        FROM wine_trigram_pairs
+        GROUP BY wine_id;
+    """)
+    conn.execute("DROP TABLE wine_trigram_pairs")
+    conn.execute("CREATE UNIQUE INDEX wine_trigrams_idx ON wine_trigrams (trigram)")
+    conn.execute(
+        "CREATE UNIQUE INDEX wine_trigram_counts_wine_idx ON wine_trigram_counts (wine_id)"
+    )
+    row_count = conn.execute("SELECT COUNT(*) FROM wine_trigrams").fetchone()[0]
+    logger.info(
+        f"Built wine search index - row count: {row_count}, duration: {time.time() - start:.2f}s"
+    )
+    return row_count
+
+
+def search_wines(
+    conn: duckdb.DuckDBPyConnection,
+    query: str,
+    limit: int = 10,
+    min_score: float = 0.3,
+) -> DataFrame:
+    """
+    Ranked, typo-tolerant search over wine, winery and region names.
+
+    Wines are scored by the share of the query's trigrams found in their indexed
+    text, with ties broken in favour of shorter, more specific texts.
+
+    :param conn: DuckDB connection to a database with the search index built.
+    :param query: Free text such as a partial or misspelt wine name.
+    :param limit: Maximum number of matches to return.
+    :param min_score: Minimum share of query trigrams a match must contain.
+    :return: DataFrame of matching wines ordered by descending score.
+    """
+    if not query or not query.strip():
+        raise ValueError("Search query cannot be empty")
+
+    return conn.execute(
+        f"""
+        WITH q AS (
+            SELECT DISTINCT unnest({_TRIGRAMS_SQL.format(text="?")}) AS trigram
+        ),
+        q_count AS (
+            SELECT COUNT(*) AS n FROM q
+        ),
+        hits AS (
+            SELECT wine_id, COUNT(*) AS shared
+            FROM (
+                SELECT unnest(t.wine_ids) AS wine_id
+                FROM wine_trigrams t
+                JOIN q ON q.trigram = t.trigram
+            )
+            GROUP BY wine_id
+            HAVING COUNT(*) >= ? * (SELECT n FROM q_count)
+        ),
+        top AS (
+            SELECT
+                h.wine_id,
+                h.shared / q_count.n AS score,
+                h.shared / (q_count.n + c.trigram_count - h.shared) AS specificity
+            FROM hits h
+            JOIN wine_trigram_counts c ON c.wine_id = h.wine_id
+            CROSS JOIN q_count
+            ORDER BY score DESC, specificity DESC, h.wine_id
+            LIMIT ?
+        )
+        SELECT
+            w.wine_id, w.wine_name, w.winery_name, w.region_name, w.country, w.type,
+            t.score
+        FROM top t
+        JOIN wines w ON w.wine_id = t.wine_id
+        ORDER BY t.score DESC, t.specificity DESC, t.wine_id
+        """,
+        [query, min_score, limit],
+    ).df()
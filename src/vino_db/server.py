@@ -0,0 +1,380 @@
+import asyncio
+import io
+import json
+import math
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import duckdb
+from loguru import logger
+
+from vino_db.queries import QUERIES_DIR, get_registry
+from vino_db.search import search_wines
+
+try:
+    import pyarrow as pa
+    from aiohttp import web
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "The query service needs the 'server' extra: pip install 'vino-db[server]'"
+    ) from e
+
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+_RESERVED_PARAMS = ("format", "page_size")
+
+
+def _json_value(value):
+    if hasattr(value, "item"):  # numpy scalars from pandas results
+        value = value.item()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _json_rows(rows: list[tuple]) -> list[list]:
+    return [[_json_value(v) for v in row] for row in rows]
+
+
+class ResultCursor:
+    """An open query result that is paged through with fetchmany."""
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection, columns: list[str]):
+        self.conn = conn
+        self.columns = columns
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()
+
+
+class QueryService:
+    """
+    Local HTTP/JSON and Arrow IPC access to a shared, read-only DuckDB database.
+
+    Requests are handled on an asyncio event loop while queries run on a thread
+    pool sized to the concurrency limit. Short lookups borrow a cursor from a
+    fixed pool; paginated results keep their own cursor open between pages so
+    later pages continue the same result instead of re-running the query.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        duckdb_config: dict | None = None,
+        queries_dir: Path = QUERIES_DIR,
+        max_concurrency: int = 8,
+        page_size: int = 1000,
+        max_page_size: int = 50_000,
+        cursor_ttl: float = 300.0,
+        max_open_cursors: int = 64,
+    ):
+        """
+        :param db_path: DuckDB database path (opened read-only).
+        :param duckdb_config: DuckDB settings, e.g. from `VinoConfig.duckdb_config()`.
+        :param queries_dir: Directory of named query templates.
+        :param max_concurrency: Maximum number of queries executing at once.
+        :param page_size: Default number of rows per JSON page.
+        :param max_page_size: Largest page size a client may request.
+        :param cursor_ttl: Seconds an idle pagination cursor is kept open.
+        :param max_open_cursors: Pagination cursors kept before evicting the oldest.
+        """
+        if max_concurrency < 1 or page_size < 1:
+            raise ValueError("max_concurrency and page_size must be positive")
+        self.db_path = db_path
+        self.duckdb_config = duckdb_config or {}
+        self.registry = get_registry(queries_dir)
+        self.max_concurrency = max_concurrency
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.cursor_ttl = cursor_ttl
+        self.max_open_cursors = max_open_cursors
+        self.conn = None
+        self.cursors: dict[str, ResultCursor] = {}
+        self._pool: asyncio.Queue | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._reaper: asyncio.Task | None = None
+
+    async def start(self, app: web.Application | None = None):
+        """Open the shared connection and its cursor pool."""
+        self.conn = duckdb.connect(
+            self.db_path, read_only=True, config=self.duckdb_config
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="vino-db-query"
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._pool = asyncio.Queue()
+        for _ in range(self.max_concurrency):
+            self._pool.put_nowait(self.conn.cursor())
+        self._reaper = asyncio.create_task(self._reap_cursors())
+        logger.info(
+            f"Query service connected to {self.db_path} (max concurrency {self.max_concurrency})"
+        )
+
+    async def stop(self, app: web.Application | None = None):
+        """Close open result cursors, the cursor pool and the shared connection."""
+        if self._reaper:
+            self._reaper.cancel()
+        for token in list(self.cursors):
+            self._close_cursor(token)
+        while self._pool and not self._pool.empty():
+            self._pool.get_nowait().close()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+        logger.info("Query service stopped")
+
+    async def _run(self, fn, *args):
+        """Run blocking DuckDB work on the query threads, within the concurrency limit."""
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _run_pooled(self, fn, *args):
+        """Like `_run`, passing a cursor borrowed from the pool as the first argument."""
+        cursor = await self._pool.get()
+        try:
+            return await self._run(fn, cursor, *args)
+        finally:
+            self._pool.put_nowait(cursor)
+
+    def _close_cursor(self, token: str):
+        result = self.cursors.pop(token, None)
+        if result:
+            result.conn.close()
+
+    async def _reap_cursors(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.cursor_ttl / 2))
+            now = time.monotonic()
+            for token, result in list(self.cursors.items()):
+                if (
+                    now - result.last_used > self.cursor_ttl
+                    and not result.lock.locked()
+                ):
+                    self._close_cursor(token)
+
+    def _open_cursor(self, conn: duckdb.DuckDBPyConnection, columns: list[str]) -> str:
+        idle = [t for t, r in self.cursors.items() if not r.lock.locked()]
+        if len(self.cursors) >= self.max_open_cursors and idle:
+            self._close_cursor(min(idle, key=lambda t: self.cursors[t].last_used))
+        token = secrets.token_urlsafe(16)
+        self.cursors[token] = ResultCursor(conn, columns)
+        return token
+
+    def _bounded_int(self, request: web.Request, name: str, default: int) -> int:
+        """An integer query parameter between 1 and max_page_size."""
+        try:
+            value = int(request.query.get(name, default))
+        except ValueError:
+            raise web.HTTPBadRequest(text=f"{name} must be an integer")
+        if not 1 <= value <= self.max_page_size:
+            raise web.HTTPBadRequest(
+                text=f"{name} must be between 1 and {self.max_page_size}"
+            )
+        return value
+
+    def _page_size(self, request: web.Request) -> int:
+        return self._bounded_int(request, "page_size", self.page_size)
+
+    @staticmethod
+    def _page(columns: list[str], rows: list[tuple], next_cursor: str | None = None):
+        body = {
+            "columns": columns,
+            "rows": _json_rows(rows),
+            "next_cursor": next_cursor,
+        }
+        return web.json_response(body)
+
+    # Handlers
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "status": "ok",
+                "database": self.db_path,
+                "open_cursors": len(self.cursors),
+            }
+        )
+
+    async def list_queries(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {"name": t.name, "description": t.description, "params": t.params}
+                for t in self.registry.templates.values()
+                if t.statement.type == duckdb.StatementType.SELECT
+            ]
+        )
+
+    async def run_query(self, request: web.Request) -> web.StreamResponse:
+        """Run a named query; JSON pages by default, an Arrow IPC stream with format=arrow."""
+        name = request.match_info["name"]
+        params = {k: v for k, v in request.query.items() if k not in _RESERVED_PARAMS}
+        if request.can_read_body:
+            body = await request.json()
+            if not isinstance(body, dict):
+                raise web.HTTPBadRequest(text="Request body must be a JSON object")
+            params.update(body)
+        try:
+            template = self.registry.get(name)
+        except KeyError as e:
+            raise web.HTTPNotFound(text=str(e).strip('"'))
+        bound = template.bind(params)
+        if template.statement.type != duckdb.StatementType.SELECT:
+            raise web.HTTPForbidden(text=f"Query '{name}' is not a read-only query")
+
+        page_size = self._page_size(request)
+        if request.query.get("format") == "arrow":
+            return await self._stream_arrow(
+                request, template.statement, bound, page_size
+            )
+
+        conn = self.conn.cursor()
+
+        def first_page():
+            conn.execute(template.statement, bound)
+            columns = [d[0] for d in conn.description]
+            return columns, conn.fetchmany(page_size)
+
+        try:
+            columns, rows = await self._run(first_page)
+        except BaseException:
+            conn.close()
+            raise
+        if len(rows) < page_size:
+            conn.close()
+            return self._page(columns, rows)
+        return self._page(columns, rows, self._open_cursor(conn, columns))
+
+    async def next_page(self, request: web.Request) -> web.Response:
+        """Fetch the next page of a result opened by `run_query`."""
+        token = request.match_info["token"]
+        result = self.cursors.get(token)
+        if result is None:
+            raise web.HTTPNotFound(text="Unknown or expired cursor")
+        page_size = self._page_size(request)
+        async with result.lock:
+            rows = await self._run(result.conn.fetchmany, page_size)
+            result.last_used = time.monotonic()
+        if len(rows) < page_size:
+            self._close_cursor(token)
+            return self._page(result.columns, rows)
+        return self._page(result.columns, rows, token)
+
+    async def close_cursor(self, request: web.Request) -> web.Response:
+        self._close_cursor(request.match_info["token"])
+        return web.Response(status=204)
+
+    async def _stream_arrow(
+        self,
+        request: web.Request,
+        statement: duckdb.Statement,
+        params: dict,
+        batch_size: int,
+    ) -> web.StreamResponse:
+        """Stream a result as Arrow IPC record batches without materialising it."""
+        conn = self.conn.cursor()
+        try:
+            reader = await self._run(
+                lambda: conn.execute(statement, params).fetch_record_batch(batch_size)
+            )
+            response = web.StreamResponse(headers={"Content-Type": ARROW_STREAM_TYPE})
+            await response.prepare(request)
+            sink = io.BytesIO()
+            writer = pa.ipc.new_stream(sink, reader.schema)
+
+            def drain() -> bytes:
+                data = sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+                return data
+
+            def next_batch():
+                try:
+                    return reader.read_next_batch()
+                except StopIteration:
+                    return None
+
+            while (batch := await self._run(next_batch)) is not None:
+                writer.write_batch(batch)
+                await response.write(drain())
+            writer.close()
+            await response.write(drain())
+            await response.write_eof()
+            return response
+        finally:
+            conn.close()
+
+    async def search(self, request: web.Request) -> web.Response:
+        query = request.query.get("q", "")
+        limit = self._bounded_int(request, "limit", 10)
+        matches = await self._run_pooled(search_wines, query, limit)
+        return self._page(list(matches.columns), list(matches.itertuples(index=False)))
+
+    async def wine_stats(self, request: web.Request) -> web.Response:
+        return await self._pooled_query(
+            "wine_stats", wine_id=request.match_info["wine_id"]
+        )
+
+    async def user_history(self, request: web.Request) -> web.Response:
+        return await self._pooled_query(
+            "user_history",
+            user_id=request.match_info["user_id"],
+            limit=self._bounded_int(request, "limit", 100),
+        )
+
+    async def _pooled_query(self, name: str, **params) -> web.Response:
+        def fetch(conn: duckdb.DuckDBPyConnection):
+            result = self.registry.execute(conn, name, **params)
+            return [d[0] for d in result.description], result.fetchall()
+
+        columns, rows = await self._run_pooled(fetch)
+        return self._page(columns, rows)
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application serving this service."""
+        app = web.Application(middlewares=[_error_middleware])
+        app.on_startup.append(self.start)
+        app.on_cleanup.append(self.stop)
+        app.router.add_get("/health", self.health)
+        app.router.add_get("/queries", self.list_queries)
+        app.router.add_route("*", "/queries/{name}", self.run_query)
+        app.router.add_get("/cursors/{token}", self.next_page)
+        app.router.add_delete("/cursors/{token}", self.close_cursor)
+        app.router.add_get("/search", self.search)
+        app.router.add_get("/wines/{wine_id}/stats", self.wine_stats)
+        app.router.add_get("/users/{user_id}/history", self.user_history)
+        return app
+
+
+@web.middleware
+async def _error_middleware(request: web.Request, handler):
+    """
+    Map the package's error conventions onto HTTP status codes. Every error,
+    including those raised as aiohttp HTTP exceptions, is a JSON {"error": ...}.
+    """
+    try:
+        return await handler(request)
+    except web.HTTPException as e:
+        if e.status < 400:
+            raise
+        return web.json_response({"error": e.text}, status=e.status)
+    except (ValueError, json.JSONDecodeError) as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except duckdb.Error as e:
+        logger.error(f"Error executing query for {request.path}: {e}")
+        return web.json_response({"error": str(e)}, status=500)
+
+
+def serve(service: QueryService, host: str = "127.0.0.1", port: int = 8765):
+    """Run the query service until interrupted."""
+    web.run_app(service.app(), host=host, port=port, print=None)
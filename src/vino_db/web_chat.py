@@ -1,9 +1,8 @@
-import os
-
-import tomllib
 from playwright.async_api import async_playwright
 from pydantic import BaseModel, Field
 
+from vino_db.config import CONFIG_PATH, load_config
+
 
 class ChatUIResponse(BaseModel):
     raw_text: str = Field(..., description="Raw response text from chat web UI")
@@ -46,31 +45,24 @@ class ChatWebUIClient:
         self.timeout = timeout
 
     @classmethod
-    def from_config(cls, config_path: str, service_name: str) -> "ChatWebUIClient":
+    def from_config(
+        cls, config_path: str = CONFIG_PATH, service_name: str | None = None
+    ) -> "ChatWebUIClient":
         """
         Initialize from a TOML config file for a specific service.
 
         :param config_path: Path to the TOML configuration file
-        :param service_name: Name of the service (e.g., 'perplexity')
+        :param service_name: Name of the service (e.g., 'perplexity'); defaults
+            to the config's default_service
         :return: ChatWebUIClient instance
         """
-        if not os.path.exists(config_path):
-            raise FileNotFoundError(f"Config file not found: {config_path}")
-
-        with open(config_path, "rb") as f:  # Open in binary mode for tomllib
-            config = tomllib.load(f)
-        service_config = config.get("services", {}).get(service_name)
+        config = load_config(config_path)
+        service_name = service_name or config.default_service
+        service_config = config.services.get(service_name)
         if not service_config:
             raise KeyError(f"Service '{service_name}' not found in config file")
 
-        return cls(
-            ui_url=service_config["ui_url"],
-            input_selector=service_config["input_selector"],
-            submit_selector=service_config["submit_selector"],
-            response_selector=service_config["response_selector"],
-            headless=service_config.get("headless", True),
-            timeout=service_config.get("timeout", 30000),
-        )
+        return cls(**service_config.model_dump())
 
     async def run_prompt(self, prompt: str) -> ChatUIResponse:
         """
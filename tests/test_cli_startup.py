@@ -0,0 +1,77 @@
+"""
+Quick CLI commands must stay within their startup-time budget.
+
+`vino-db list-services` is run repeatedly in fresh interpreters and its median
+wall time, minus the median time of a bare interpreter, is compared with the
+budget. The heavy dependencies must not be imported along the way.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGET_MS = 100.0
+RUNS = 15
+HEAVY_MODULES = ("playwright", "duckdb", "pandas", "pydantic", "asyncio")
+
+
+@pytest.fixture(scope="module")
+def env() -> dict[str, str]:
+    """Environment for subprocesses, importing vino_db from the source tree."""
+    pythonpath = os.pathsep.join(
+        p for p in (str(ROOT / "src"), os.environ.get("PYTHONPATH")) if p
+    )
+    return {**os.environ, "PYTHONPATH": pythonpath}
+
+
+def median_run_ms(args: list[str], env: dict[str, str]) -> float:
+    """Median wall time in milliseconds of running the interpreter with args."""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args], check=True, capture_output=True, cwd=ROOT, env=env
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def imported_heavy_modules(code: str, env: dict[str, str]) -> list[str]:
+    """Heavy top-level modules imported after running code in a fresh interpreter."""
+    probe = (
+        f"{code}\nimport sys\nprint(' '.join({{m.split('.')[0] for m in sys.modules}}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env=env,
+    )
+    loaded = set(result.stdout.split())
+    return [m for m in HEAVY_MODULES if m in loaded]
+
+
+def test_list_services_within_budget(env):
+    overhead = median_run_ms(["-m", "vino_db.cli", "list-services"], env)
+    overhead -= median_run_ms(["-c", "pass"], env)
+    assert overhead <= BUDGET_MS, (
+        f"list-services startup overhead {overhead:.1f} ms exceeds {BUDGET_MS:.0f} ms"
+    )
+
+
+def test_list_services_imports_no_heavy_modules(env):
+    code = "from vino_db.cli import cli\ncli(['list-services'], standalone_mode=False)"
+    assert imported_heavy_modules(code, env) == []
+
+
+def test_load_config_imports_no_database_stack(env):
+    code = "from vino_db.config import load_config\nload_config()"
+    assert imported_heavy_modules(code, env) == ["pydantic"]
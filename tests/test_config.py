@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+
+from vino_db.config import load_config, read_config, resolve_default_service
+from vino_db.config_models import VinoConfig
+
+SERVICE = {
+    "ui_url": "https://chat.example",
+    "input_selector": "textarea",
+    "submit_selector": "button",
+    "response_selector": ".answer",
+}
+
+
+def test_duckdb_config_keeps_duckdb_spill_default():
+    assert VinoConfig().duckdb_config() == {}
+
+
+def test_duckdb_config_overlays_explicit_settings_on_profile():
+    config = VinoConfig.model_validate(
+        {"duckdb": {"profile": "laptop", "threads": 2, "temp_directory": "/tmp/spill"}}
+    )
+    settings = config.duckdb_config()
+    assert settings["threads"] == 2
+    assert settings["memory_limit"] == "4GB"
+    assert settings["temp_directory"] == "/tmp/spill"
+    assert config.result_budget() == "1GB"
+
+
+def test_default_service_falls_back_to_first_service():
+    assert resolve_default_service("", ["grok", "perplexity"]) == "grok"
+    assert resolve_default_service("", []) == ""
+    with pytest.raises(ValueError, match="not defined"):
+        resolve_default_service("missing", ["grok"])
+
+
+def test_raw_and_validated_configs_agree(tmp_path: Path):
+    path = tmp_path / "config.toml"
+    lines = [f'{key} = "{value}"' for key, value in SERVICE.items()]
+    path.write_text("[services.b]\n" + "\n".join(lines) + "\n")
+    raw = read_config(path)
+    assert load_config(path).default_service == resolve_default_service(
+        raw.get("default_service", ""), list(raw["services"])
+    )
+
+
+def test_invalid_config_is_a_value_error(tmp_path: Path):
+    path = tmp_path / "config.toml"
+    path.write_text('[duckdb]\nprofile = "tiny"\n')
+    with pytest.raises(ValueError, match="Unknown execution profile"):
+        load_config(path)
@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pytest
+
+from vino_db import ddb
+from vino_db.ddb import DuckDBRunner
+from vino_db.execution import (
+    ResultTooLargeError,
+    estimate_result_bytes,
+    result_shape,
+    write_parquet,
+)
+
+ROWS = 50_000
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "ratings.duckdb")
+    with duckdb.connect(path) as conn:
+        conn.execute(f"""
+            CREATE TABLE ratings AS
+            SELECT
+                i AS rating_id,
+                i % 500 AS wine_id,
+                (i % 10) / 2.0 AS rating,
+                TIMESTAMP '2020-01-01' + INTERVAL (i) MINUTE AS rating_date
+            FROM range({ROWS}) t(i)
+        """)
+    return path
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM ratings",
+        "SELECT * FROM ratings ORDER BY rating",
+        "SELECT * FROM ratings ORDER BY rating_date DESC",
+    ],
+)
+def test_estimate_covers_full_results(db_path, sql):
+    with duckdb.connect(db_path, read_only=True) as conn:
+        assert estimate_result_bytes(conn, sql) >= ROWS
+
+
+def test_estimate_uses_top_n_bound(db_path):
+    with duckdb.connect(db_path, read_only=True) as conn:
+        estimate = estimate_result_bytes(
+            conn, "SELECT * FROM ratings ORDER BY rating LIMIT 3"
+        )
+    assert estimate < 1000
+
+
+def test_run_refuses_sorted_result_over_budget(db_path):
+    with DuckDBRunner(db_path, result_budget="10KB", verbose=False) as runner:
+        with pytest.raises(ResultTooLargeError):
+            runner.run("SELECT * FROM ratings ORDER BY rating_date DESC")
+        assert len(runner.run("SELECT * FROM ratings ORDER BY rating LIMIT 3")) == 3
+
+
+def test_run_streams_or_writes_parquet_over_budget(db_path, tmp_path):
+    sql = "SELECT * FROM ratings ORDER BY rating"
+    with DuckDBRunner(
+        db_path, result_budget="10KB", on_large_result="stream", verbose=False
+    ) as runner:
+        assert sum(len(batch) for batch in runner.run(sql)) == ROWS
+    with DuckDBRunner(
+        db_path,
+        result_budget="10KB",
+        on_large_result="parquet",
+        results_dir=tmp_path / "results",
+        verbose=False,
+    ) as runner:
+        assert len(pd.read_parquet(runner.run(sql))) == ROWS
+
+
+@pytest.mark.parametrize(
+    ("sql", "params", "rows"),
+    [
+        ("SELECT * FROM ratings LIMIT 5", None, 5),
+        ("SELECT * FROM ratings ORDER BY rating_date LIMIT $limit", {"limit": 7}, 7),
+        ("SELECT * FROM ratings ORDER BY rating_date LIMIT ?", [ROWS], ROWS),
+    ],
+)
+def test_estimate_applies_limit_clause(db_path, sql, params, rows):
+    with duckdb.connect(db_path, read_only=True) as conn:
+        estimate = estimate_result_bytes(conn, sql, params)
+        width = estimate_result_bytes(conn, "SELECT * FROM ratings LIMIT 1")
+    assert estimate == rows * width
+
+
+def test_write_parquet_accepts_trailing_comment(db_path, tmp_path):
+    sql = "SELECT * FROM ratings WHERE rating_id < $n; -- first rows only"
+    with duckdb.connect(db_path, read_only=True) as conn:
+        path = write_parquet(conn, sql, tmp_path / "out.parquet", {"n": 10})
+    assert len(pd.read_parquet(path)) == 10
+
+
+def test_stream_survives_other_queries(db_path):
+    with DuckDBRunner(
+        db_path, result_budget="10KB", on_large_result="stream", verbose=False
+    ) as runner:
+        batches = runner.run("SELECT * FROM ratings ORDER BY rating")
+        assert len(runner.run("SELECT 1 AS one")) == 1
+        assert sum(len(batch) for batch in batches) == ROWS
+
+
+def test_named_query_guard_plans_only_unbounded_results(db_path, tmp_path, monkeypatch):
+    queries = tmp_path / "queries"
+    queries.mkdir()
+    (queries / "recent.sql").write_text(
+        "-- Latest ratings.\n-- :param limit: INTEGER\n"
+        "SELECT * FROM ratings ORDER BY rating_date DESC LIMIT $limit;\n"
+    )
+    shapes, plans = [], []
+    monkeypatch.setattr(
+        ddb, "result_shape", lambda *args: shapes.append(args) or result_shape(*args)
+    )
+    monkeypatch.setattr(
+        ddb,
+        "estimate_result_bytes",
+        lambda *args: plans.append(args) or estimate_result_bytes(*args),
+    )
+    with DuckDBRunner(
+        db_path, result_budget="10KB", queries_dir=queries, verbose=False
+    ) as runner:
+        assert len(runner.run_query("recent", limit=5)) == 5
+        assert len(runner.run_query("recent", limit=10)) == 10
+        assert not plans
+        with pytest.raises(ResultTooLargeError):
+            runner.run_query("recent", limit=ROWS)
+    assert len(shapes) == 1
+    assert len(plans) == 1
@@ -0,0 +1,95 @@
+from datetime import date, datetime
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from vino_db.queries import LOADERS_DIR, QUERIES_DIR, QueryRegistry, parse_template
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TEMPLATE = """-- Ratings for one wine since a date.
+-- :param wine_id: INTEGER
+-- :param since: DATE
+-- :param verified: BOOLEAN
+SELECT $wine_id AS wine_id, $since AS since, $verified AS verified;
+"""
+
+
+def test_parse_template_reads_header():
+    template = parse_template("ratings", TEMPLATE)
+    assert template.description == "Ratings for one wine since a date."
+    assert template.params == {
+        "wine_id": "INTEGER",
+        "since": "DATE",
+        "verified": "BOOLEAN",
+    }
+
+
+@pytest.mark.parametrize(
+    ("sql", "message"),
+    [
+        ("-- :param wine_id: INTEGER\nSELECT $wine", "declares parameters"),
+        ("SELECT $wine_id", "declares parameters"),
+        ("-- :param wine_id: UUID\nSELECT $wine_id", "Unsupported type"),
+        ("SELECT 1; SELECT 2;", "exactly one statement"),
+    ],
+)
+def test_parse_template_rejects_invalid_templates(sql, message):
+    with pytest.raises(ValueError, match=message):
+        parse_template("bad", sql)
+
+
+def test_bind_converts_values():
+    template = parse_template("ratings", TEMPLATE)
+    bound = template.bind({"wine_id": "42", "since": "2024-02-29", "verified": "true"})
+    assert bound == {"wine_id": 42, "since": date(2024, 2, 29), "verified": True}
+    bound = template.bind(
+        {"wine_id": 42, "since": datetime(2024, 2, 29, 12), "verified": "0"}
+    )
+    assert bound["since"] == date(2024, 2, 29)
+    assert bound["verified"] is False
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"wine_id": True, "since": "2024-01-01", "verified": True},
+        {"wine_id": "forty", "since": "2024-01-01", "verified": True},
+        {"wine_id": 1, "since": "01/02/2024", "verified": True},
+        {"wine_id": 1, "since": "2024-01-01", "verified": "maybe"},
+    ],
+)
+def test_bind_rejects_invalid_values(params):
+    template = parse_template("ratings", TEMPLATE)
+    with pytest.raises(ValueError, match="Invalid value"):
+        template.bind(params)
+
+
+def test_bind_rejects_missing_and_unexpected_params():
+    template = parse_template("ratings", TEMPLATE)
+    with pytest.raises(ValueError, match="missing: \\['verified'\\]"):
+        template.bind({"wine_id": 1, "since": "2024-01-01", "extra": 1})
+
+
+def test_registry_executes_with_bound_params(tmp_path: Path):
+    (tmp_path / "ratings.sql").write_text(TEMPLATE)
+    registry = QueryRegistry(tmp_path)
+    conn = duckdb.connect()
+    row = registry.execute(
+        conn, "ratings", wine_id="7", since="2024-01-01", verified=1
+    ).fetchone()
+    assert row == (7, date(2024, 1, 1), True)
+    with pytest.raises(KeyError, match="not found"):
+        registry.get("missing")
+
+
+def test_public_registry_holds_only_read_only_lookups():
+    public = QueryRegistry(ROOT / QUERIES_DIR)
+    loaders = QueryRegistry(ROOT / LOADERS_DIR)
+    assert not set(public.names()) & set(loaders.names())
+    assert {"load_wines", "stage_ratings"} <= set(loaders.names())
+    assert all(
+        t.statement.type == duckdb.StatementType.SELECT
+        for t in public.templates.values()
+    )
@@ -0,0 +1,176 @@
+import math
+import random
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pytest
+
+from vino_db.recommend import WineRecommender
+
+# Three users and three wines, small enough to check similarities by hand
+HAND_RATINGS = [
+    (1, 1, 5.0),
+    (1, 2, 3.0),
+    (2, 1, 4.0),
+    (2, 2, 4.0),
+    (2, 3, 2.0),
+    (3, 2, 1.0),
+    (3, 3, 5.0),
+]
+
+
+def _create_db(path: Path, ratings: list[tuple[int, int, float]]) -> str:
+    wine_ids = sorted({wine_id for _, wine_id, _ in ratings})
+    with duckdb.connect(str(path)) as conn:
+        conn.execute(
+            "CREATE TABLE ratings (user_id INTEGER, wine_id INTEGER, rating DOUBLE)"
+        )
+        conn.executemany("INSERT INTO ratings VALUES (?, ?, ?)", ratings)
+        conn.execute(
+            "CREATE TABLE wines (wine_id INTEGER, wine_name VARCHAR, winery_name VARCHAR)"
+        )
+        conn.executemany(
+            "INSERT INTO wines VALUES (?, ?, ?)",
+            [(w, f"Wine {w}", "Winery") for w in wine_ids],
+        )
+    return str(path)
+
+
+def _neighbours(recommender: WineRecommender) -> pd.DataFrame:
+    return recommender.conn.execute(
+        "SELECT * FROM wine_neighbours ORDER BY wine_id, neighbour_id"
+    ).df()
+
+
+@pytest.fixture
+def hand_db(tmp_path: Path) -> str:
+    return _create_db(tmp_path / "hand.duckdb", HAND_RATINGS)
+
+
+@pytest.fixture
+def random_db(tmp_path: Path) -> str:
+    rng = random.Random(0)
+    ratings = [
+        (user_id, wine_id, rng.choice([1.0, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0]))
+        for user_id in range(1, 41)
+        for wine_id in range(1, 16)
+        if rng.random() < 0.5
+    ]
+    return _create_db(tmp_path / "random.duckdb", ratings)
+
+
+def _similarity(path: str, method: str, wine_id: int, neighbour_id: int) -> float:
+    recommender = WineRecommender(path)
+    try:
+        recommender.build_neighbours(k=10, method=method, min_support=1, workers=1)
+        return recommender.conn.execute(
+            "SELECT similarity FROM wine_neighbours WHERE wine_id = ? AND neighbour_id = ?",
+            [wine_id, neighbour_id],
+        ).fetchone()[0]
+    finally:
+        recommender.close()
+
+
+def test_cosine_matches_hand_computation(hand_db):
+    # Users 1 and 2 rated both wines; norms use every rating of each wine
+    expected = (5 * 3 + 4 * 4) / math.sqrt((5**2 + 4**2) * (3**2 + 4**2 + 1**2))
+    assert _similarity(hand_db, "cosine", 1, 2) == pytest.approx(expected)
+
+
+def test_adjusted_cosine_matches_hand_computation(hand_db):
+    # User means 4, 10/3 and 3 give centred vectors
+    # wine 1: (1, 2/3, -) and wine 2: (-1, 2/3, -2)
+    dot = 1 * -1 + (2 / 3) * (2 / 3)
+    norms = math.sqrt(1 + 4 / 9) * math.sqrt(1 + 4 / 9 + 4)
+    assert _similarity(hand_db, "adjusted_cosine", 1, 2) == pytest.approx(dot / norms)
+
+
+def test_parallel_build_matches_serial(random_db):
+    recommender = WineRecommender(random_db)
+    try:
+        recommender.build_neighbours(k=5, min_support=2, workers=1)
+        serial = _neighbours(recommender)
+        recommender.build_neighbours(k=5, min_support=2, block_size=4, workers=2)
+        parallel = _neighbours(recommender)
+    finally:
+        recommender.close()
+    assert not serial.empty
+    pd.testing.assert_frame_equal(serial, parallel)
+    # Worker spill directories are removed after the build
+    assert not Path(f"{random_db}.tmp").exists()
+
+
+def test_min_support_and_top_k(random_db):
+    recommender = WineRecommender(random_db)
+    try:
+        recommender.build_neighbours(k=100, min_support=1, workers=1)
+        everything = _neighbours(recommender)
+        recommender.build_neighbours(k=3, min_support=8, workers=1)
+        kept = _neighbours(recommender)
+    finally:
+        recommender.close()
+
+    assert (kept["support"] >= 8).all()
+    assert kept.groupby("wine_id").size().max() <= 3
+    # Each wine keeps exactly its 3 most similar sufficiently supported neighbours
+    expected = (
+        everything[everything["support"] >= 8]
+        .sort_values(["wine_id", "similarity", "neighbour_id"], ascending=[1, 0, 1])
+        .groupby("wine_id")
+        .head(3)
+        .sort_values(["wine_id", "neighbour_id"])
+        .reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(kept, expected)
+
+
+def test_build_drops_staging_tables(random_db, monkeypatch):
+    recommender = WineRecommender(random_db)
+    try:
+        recommender.build_neighbours(k=3, workers=1)
+
+        def fail(block_size):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(recommender, "_block_bounds", fail)
+        with pytest.raises(RuntimeError):
+            recommender.build_neighbours(k=3, workers=1)
+        staged = recommender.conn.execute(
+            "SELECT COUNT(*) FROM duckdb_tables() "
+            "WHERE table_name IN ('wine_vectors', 'wine_norms')"
+        ).fetchone()[0]
+    finally:
+        recommender.close()
+    assert staged == 0
+
+
+def test_recommendations_exclude_rated_wines(random_db):
+    recommender = WineRecommender(random_db)
+    try:
+        recommender.build_neighbours(k=5, min_support=2, workers=1)
+        rated = {
+            row[0]
+            for row in recommender.conn.execute(
+                "SELECT wine_id FROM ratings WHERE user_id = 1"
+            ).fetchall()
+        }
+        recommendations = recommender.recommend_for_user(1, n=20)
+    finally:
+        recommender.close()
+    assert not recommendations.empty
+    assert rated.isdisjoint(recommendations["wine_id"])
+    assert recommendations["score"].is_monotonic_decreasing
+
+
+def test_shrinkage_pulls_scores_towards_zero(hand_db):
+    recommender = WineRecommender(hand_db)
+    try:
+        recommender.build_neighbours(k=10, method="cosine", min_support=1, workers=1)
+        raw = recommender.recommend_for_user(1, shrinkage=0.0)
+        shrunk = recommender.recommend_for_user(1, shrinkage=1.0)
+    finally:
+        recommender.close()
+    # Without shrinkage the score is the weighted mean of the user's ratings
+    assert raw["score"].between(3.0, 5.0).all()
+    assert (shrunk["score"] < raw["score"]).all()
@@ -0,0 +1,133 @@
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pytest
+
+from vino_db.queries import LOADERS_DIR
+from vino_db.rollups import (
+    ROLLUP_TABLES,
+    append_ratings,
+    build_rollups,
+    choose_rollup,
+    rating_trends,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+CSV_HEADER = "RatingID,UserID,WineID,Vintage,Rating,Date\n"
+
+
+@pytest.fixture
+def conn(tmp_path: Path):
+    conn = duckdb.connect(str(tmp_path / "wines.duckdb"))
+    conn.execute((ROOT / "sql/create_tables.sql").read_text())
+    conn.execute("INSERT INTO users VALUES (1), (2)")
+    conn.execute("""
+        INSERT INTO wines (wine_id, wine_name, type, country, region_name)
+        VALUES (1, 'Pinot Noir', 'Red', 'France', 'Burgundy'),
+               (2, 'Merlot', 'Red', 'United States', 'Napa Valley'),
+               (3, 'Table Wine', 'White', NULL, NULL)
+    """)
+    conn.execute("""
+        INSERT INTO ratings VALUES
+            (1, 1, 1, '2020', 4.0, '2024-01-05 10:00:00'),
+            (2, 2, 1, '2020', 3.5, '2024-01-20 10:00:00'),
+            (3, 1, 2, '2019', 5.0, '2024-02-01 10:00:00'),
+            (4, 2, 3, '2021', 2.0, '2024-02-03 10:00:00')
+    """)
+    build_rollups(conn)
+    yield conn
+    conn.close()
+
+
+def _write_csv(path: Path, rows: list[str]) -> Path:
+    path.write_text(CSV_HEADER + "\n".join(rows) + "\n")
+    return path
+
+
+def _snapshot(conn: duckdb.DuckDBPyConnection) -> dict[str, pd.DataFrame]:
+    tables = ["ratings", "users", *ROLLUP_TABLES.values()]
+    return {
+        table: conn.execute(f"SELECT * FROM {table} ORDER BY ALL").df()
+        for table in tables
+    }
+
+
+def test_append_matches_full_rebuild(conn, tmp_path):
+    csv = _write_csv(
+        tmp_path / "new.csv",
+        [
+            # Existing buckets, a new month, a new user and the NULL-keyed wine
+            "5,1,1,2020,4.5,2024-01-05 18:00:00",
+            "6,3,2,2019,3.0,2024-02-01 09:00:00",
+            "7,3,3,2021,1.5,2024-02-03 12:00:00",
+            "8,2,3,2021,3.0,2024-03-10 12:00:00",
+        ],
+    )
+    assert append_ratings(conn, csv, ROOT / LOADERS_DIR) == 4
+    appended = _snapshot(conn)
+    build_rollups(conn)
+    rebuilt = _snapshot(conn)
+
+    for table in ROLLUP_TABLES.values():
+        pd.testing.assert_frame_equal(appended[table], rebuilt[table])
+    assert len(appended["ratings"]) == 8
+    assert 3 in set(appended["users"]["user_id"])
+    null_keyed = appended["ratings_rollup_month"].query("country.isna()")
+    assert null_keyed["rating_count"].tolist() == [2, 1]
+
+
+def test_failed_append_changes_nothing(conn, tmp_path):
+    csv = _write_csv(
+        tmp_path / "dup.csv",
+        [
+            "9,4,1,2020,4.0,2024-04-01 10:00:00",
+            "1,4,2,2019,3.0,2024-04-02 10:00:00",  # rating_id 1 already exists
+        ],
+    )
+    before = _snapshot(conn)
+    with pytest.raises(duckdb.ConstraintException):
+        append_ratings(conn, csv, ROOT / LOADERS_DIR)
+    after = _snapshot(conn)
+
+    for table, frame in before.items():
+        pd.testing.assert_frame_equal(frame, after[table])
+    staged = conn.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'new_ratings'"
+    ).fetchone()[0]
+    assert staged == 0
+
+
+@pytest.mark.parametrize(
+    ("granularity", "start", "end", "table"),
+    [
+        ("month", None, None, "ratings_rollup_month"),
+        ("year", date(2024, 1, 1), date(2025, 1, 1), "ratings_rollup_month"),
+        ("quarter", date(2024, 1, 15), None, "ratings_rollup_day"),
+        ("month", None, date(2024, 3, 2), "ratings_rollup_day"),
+        ("week", date(2024, 1, 1), None, "ratings_rollup_day"),
+        ("day", None, None, "ratings_rollup_day"),
+    ],
+)
+def test_choose_rollup(granularity, start, end, table):
+    assert choose_rollup(granularity, start, end) == table
+
+
+def test_choose_rollup_rejects_unknown_granularity():
+    with pytest.raises(ValueError, match="Unknown granularity"):
+        choose_rollup("decade")
+
+
+def test_trends_recombine_means(conn):
+    trends = rating_trends(conn, "month", start="2024-01-01", end="2024-02-01")
+    assert trends["rating_count"].tolist() == [2]
+    assert trends["mean_rating"].tolist() == [3.75]
+    assert trends["stddev_rating"].tolist() == pytest.approx([0.25])
+
+
+def test_trends_need_rollups(conn):
+    for table in ROLLUP_TABLES.values():
+        conn.execute(f"DROP TABLE {table}")
+    with pytest.raises(ValueError, match="build-rollups"):
+        rating_trends(conn)
@@ -0,0 +1,62 @@
+import duckdb
+import pytest
+
+from vino_db.search import build_search_index, search_wines
+
+WINES = [
+    (1, "Pinot Noir Reserve", "Domaine Rion", "Burgundy", "France", "Red"),
+    (2, "Grand Vin", "Château Margaux", "Margaux", "France", "Red"),
+    (3, "Merlot", "Napa Cellars", "Napa Valley", "United States", "Red"),
+    (4, "Pinot Noir", "Domaine Rion", "Burgundy", "France", "Red"),
+    (5, "Pinot Grigio", "Cantina Sociale", "Veneto", "Italy", "White"),
+]
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE wines (
+            wine_id INTEGER, wine_name VARCHAR, winery_name VARCHAR,
+            region_name VARCHAR, country VARCHAR, type VARCHAR
+        )
+    """)
+    conn.executemany("INSERT INTO wines VALUES (?, ?, ?, ?, ?, ?)", WINES)
+    build_search_index(conn)
+    yield conn
+    conn.close()
+
+
+def test_tolerates_typos(conn):
+    matches = search_wines(conn, "pinot nior")
+    assert set(matches["wine_id"][:2]) == {1, 4}
+
+
+def test_folds_accents(conn):
+    matches = search_wines(conn, "chateau margaux")
+    assert matches["wine_id"][0] == 2
+    assert matches["winery_name"][0] == "Château Margaux"
+
+
+def test_min_score_cuts_off_partial_matches(conn):
+    # Pinot Grigio shares only the 'pinot' trigrams with the query
+    assert 5 in set(search_wines(conn, "pinot noir", min_score=0.3)["wine_id"])
+    assert 5 not in set(search_wines(conn, "pinot noir", min_score=0.9)["wine_id"])
+    assert search_wines(conn, "zinfandel").empty
+
+
+def test_ties_prefer_more_specific_text(conn):
+    matches = search_wines(conn, "pinot noir burgundy")
+    # Both contain every query trigram; the shorter text ranks first
+    assert list(matches["wine_id"][:2]) == [4, 1]
+    assert matches["score"][0] == matches["score"][1] == 1.0
+
+
+def test_limit(conn):
+    assert len(search_wines(conn, "pinot", limit=2)) == 2
+
+
+@pytest.mark.parametrize("query", ["", "   "])
+def test_rejects_empty_query(conn, query):
+    with pytest.raises(ValueError, match="cannot be empty"):
+        search_wines(conn, query)
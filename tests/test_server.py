@@ -0,0 +1,171 @@
+import asyncio
+import shutil
+from pathlib import Path
+
+import duckdb
+import pytest
+
+pytest.importorskip("aiohttp", reason="needs the 'server' extra")
+pa = pytest.importorskip("pyarrow", reason="needs the 'server' extra")
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from vino_db.queries import QUERIES_DIR
+from vino_db.search import build_search_index
+from vino_db.server import ARROW_STREAM_TYPE, QueryService
+
+ROOT = Path(__file__).resolve().parents[1]
+RATINGS = 25
+ALL_DATES = "start_date=2000-01-01&end_date=2100-01-01&limit=100"
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "wines.duckdb")
+    with duckdb.connect(path) as conn:
+        conn.execute((ROOT / "sql/create_tables.sql").read_text())
+        conn.execute("INSERT INTO users VALUES (1), (2)")
+        conn.execute("""
+            INSERT INTO wines (wine_id, wine_name, winery_name, region_name, country, type)
+            VALUES (1, 'Pinot Noir', 'Domaine Rion', 'Burgundy', 'France', 'Red'),
+                   (2, 'Merlot', 'Napa Cellars', 'Napa Valley', 'United States', 'Red')
+        """)
+        conn.execute(f"""
+            INSERT INTO ratings
+            SELECT i, 1 + i % 2, 1 + i % 2, '2020', 1.0 + (i % 9) / 2,
+                   TIMESTAMP '2024-01-01' + INTERVAL (i) DAY
+            FROM range(1, {RATINGS + 1}) t(i)
+        """)
+        build_search_index(conn)
+    return path
+
+
+@pytest.fixture
+def queries_dir(tmp_path: Path) -> Path:
+    queries = tmp_path / "queries"
+    shutil.copytree(ROOT / QUERIES_DIR, queries)
+    (queries / "purge.sql").write_text(
+        "-- Delete every rating.\nDELETE FROM ratings;\n"
+    )
+    return queries
+
+
+@pytest.fixture
+def serve(db_path, queries_dir):
+    """Run a scenario against a test server: serve(scenario, **service_kwargs)."""
+
+    def run(scenario, **kwargs):
+        async def main():
+            service = QueryService(db_path, queries_dir=queries_dir, **kwargs)
+            async with TestClient(TestServer(service.app())) as client:
+                return await scenario(client, service)
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_pages_follow_cursor_to_the_end(serve):
+    async def scenario(client, service):
+        response = await client.get(
+            f"/queries/ratings_by_date_range?{ALL_DATES}&page_size=10"
+        )
+        pages = [await response.json()]
+        while pages[-1]["next_cursor"]:
+            response = await client.get(
+                f"/cursors/{pages[-1]['next_cursor']}?page_size=10"
+            )
+            assert response.status == 200
+            pages.append(await response.json())
+        return pages, service.cursors
+
+    pages, open_cursors = serve(scenario)
+    assert [len(p["rows"]) for p in pages] == [10, 10, 5]
+    rating_ids = [row[0] for p in pages for row in p["rows"]]
+    assert rating_ids == list(range(1, RATINGS + 1))
+    assert pages[0]["columns"][0] == "rating_id"
+    assert open_cursors == {}
+
+
+def test_arrow_stream_round_trip(serve):
+    async def scenario(client, service):
+        response = await client.get(
+            f"/queries/ratings_by_date_range?{ALL_DATES}&format=arrow&page_size=7"
+        )
+        assert response.headers["Content-Type"] == ARROW_STREAM_TYPE
+        return await response.read()
+
+    table = pa.ipc.open_stream(serve(scenario)).read_all()
+    assert table.num_rows == RATINGS
+    assert table.column("rating_id").to_pylist() == list(range(1, RATINGS + 1))
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "body", "status"),
+    [
+        ("GET", "/queries/wine_stats?wine_id=x", None, 400),
+        ("POST", "/queries/wine_stats", [1], 400),
+        ("GET", f"/queries/ratings_by_date_range?{ALL_DATES}&page_size=0", None, 400),
+        ("GET", "/search?q=pinot&limit=-1", None, 400),
+        ("GET", "/users/1/history?limit=abc", None, 400),
+        ("GET", "/queries/missing", None, 404),
+        ("GET", "/cursors/unknown", None, 404),
+        ("GET", "/queries/purge", None, 403),
+    ],
+)
+def test_errors_are_json(serve, method, url, body, status):
+    async def scenario(client, service):
+        response = await client.request(method, url, json=body)
+        return response.status, await response.json()
+
+    actual_status, payload = serve(scenario)
+    assert actual_status == status
+    assert payload["error"]
+
+
+def test_write_queries_are_not_listed(serve):
+    async def scenario(client, service):
+        return await (await client.get("/queries")).json()
+
+    names = {query["name"] for query in serve(scenario)}
+    assert "purge" not in names
+    assert "wine_stats" in names
+
+
+def test_lookups(serve):
+    async def scenario(client, service):
+        stats = await (await client.get("/wines/1/stats")).json()
+        history = await (await client.get("/users/2/history?limit=3")).json()
+        matches = await (await client.get("/search?q=pinot%20nior")).json()
+        return stats, history, matches
+
+    stats, history, matches = serve(scenario)
+    assert stats["rows"][0][:2] == [1, "Pinot Noir"]
+    assert len(history["rows"]) == 3
+    assert matches["rows"][0][0] == 1
+
+
+def test_idle_cursors_expire(serve):
+    async def scenario(client, service):
+        first = await (
+            await client.get(f"/queries/ratings_by_date_range?{ALL_DATES}&page_size=5")
+        ).json()
+        await asyncio.sleep(1.5)
+        response = await client.get(f"/cursors/{first['next_cursor']}")
+        return response.status, service.cursors
+
+    status, open_cursors = serve(scenario, cursor_ttl=0.2)
+    assert status == 404
+    assert open_cursors == {}
+
+
+def test_closed_cursors_are_gone(serve):
+    async def scenario(client, service):
+        first = await (
+            await client.get(f"/queries/ratings_by_date_range?{ALL_DATES}&page_size=5")
+        ).json()
+        deleted = await client.delete(f"/cursors/{first['next_cursor']}")
+        after = await client.get(f"/cursors/{first['next_cursor']}")
+        return deleted.status, after.status
+
+    assert serve(scenario) == (204, 404)